@@ -0,0 +1,69 @@
+"""
+Compares the installed JSON codecs decoding large time_entries list
+responses, against requests' own res.json() (which uses simplejson when
+it is installed).
+
+    PYTHONPATH=. python benchmarks/bench_codec.py [rows]
+"""
+import gc
+import json
+import sys
+import time
+from datetime import date, timedelta
+import requests
+from tenthousandfeet.codec import codecs
+
+
+def make_body(count):
+    start = date(2014, 1, 1)
+    return json.dumps({
+        'data': [
+            {
+                'id': i,
+                'user_id': i % 500,
+                'assignable_id': i % 200,
+                'hours': 8,
+                'date': (start + timedelta(days=i % 365)).isoformat(),
+                'notes': u'Caf\xe9 planning %d' % i,
+                'created_at': '2014-07-23T00:22:%02dZ' % (i % 60),
+                'updated_at': '2014-07-23T00:%02d:24Z' % (i % 60)
+            }
+            for i in range(count)
+        ],
+        'paging': {'page': 1, 'per_page': count, 'next': None}
+    })
+
+
+def make_response(content):
+    res = requests.Response()
+    res.status_code = 200
+    res._content = content
+    res.headers['Content-Type'] = 'application/json'
+    return res
+
+
+def bench(fn, content, repeat):
+    best = None
+    for i in range(repeat):
+        res = make_response(content)
+        gc.collect()
+        started = time.time()
+        fn(res)
+        elapsed = time.time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    content = make_body(count)
+    print '%d rows, %.1f MB' % (count, len(content) / 1e6)
+    baseline = bench(lambda res: res.json(), content, 5)
+    print '%-12s %7.1f ms' % ('res.json()', baseline * 1e3)
+    for name, codec in sorted(codecs.items()):
+        elapsed = bench(codec.decode, content, 5)
+        print '%-12s %7.1f ms   %.1fx' % (name, elapsed * 1e3, baseline / elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Measures client construction and sub-collection access.
+
+    PYTHONPATH=. python benchmarks/bench_construction.py [ids]
+"""
+import sys
+import timeit
+from tenthousandfeet import TenThousandFeet, TEST_URL
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    client = TenThousandFeet('token', endpoint=TEST_URL)
+
+    def construct():
+        TenThousandFeet('token', endpoint=TEST_URL)
+
+    def access():
+        for user_id in xrange(count):
+            client.users.time_entries(user_id)
+
+    def access_projects():
+        for project_id in xrange(count):
+            client.projects.budget_items(project_id)
+
+    runs = 100
+    print 'construct TenThousandFeet: %.1f us' % (min(timeit.repeat(construct, number=runs, repeat=3)) / runs * 1e6)
+    for name, fn in [('users.time_entries(id)', access), ('projects.budget_items(id)', access_projects)]:
+        first = timeit.timeit(fn, number=1)
+        second = timeit.timeit(fn, number=1)
+        print '%s x %d: %.1f ms first pass, %.1f ms second pass' % (name, count, first * 1e3, second * 1e3)
+
+
+if __name__ == '__main__':
+    main()
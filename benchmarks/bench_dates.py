@@ -0,0 +1,59 @@
+"""
+Compares date decoding with dateutil and with parse_date on a large
+time_entries list payload.
+
+    PYTHONPATH=. python benchmarks/bench_dates.py [rows]
+"""
+import sys
+import time
+from copy import deepcopy
+from datetime import date, timedelta
+from tenthousandfeet import CollectionClient, HTTPClient, date_parse, parse_date
+from tenthousandfeet import dates
+
+
+def make_rows(count):
+    start = date(2014, 1, 1)
+    return [
+        {
+            'id': i,
+            'user_id': i % 500,
+            'hours': 8,
+            'date': (start + timedelta(days=i % 365)).isoformat(),
+            'created_at': '2014-07-23T00:22:%02dZ' % (i % 60),
+            'updated_at': '2014-07-23T00:%02d:24Z' % (i % 60)
+        }
+        for i in range(count)
+    ]
+
+
+def bench(fn, rows):
+    client = CollectionClient(HTTPClient('token', 'http://endpoint'), 'time_entries', {
+        'list': {
+            'process': {
+                'date': fn,
+                'created_at': fn,
+                'updated_at': fn
+            }
+        }
+    }, {})
+    data = deepcopy(rows)
+    dates.memo.clear()
+    started = time.time()
+    client.process_response_data('list', data)
+    return time.time() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = make_rows(count)
+    slow = bench(date_parse, rows)
+    fast = bench(parse_date, rows)
+    print '%d rows' % count
+    print 'dateutil:   %.3fs (%.1f us/row)' % (slow, slow / count * 1e6)
+    print 'parse_date: %.3fs (%.1f us/row)' % (fast, fast / count * 1e6)
+    print 'speedup:    %.1fx' % (slow / fast)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Runs the client against the local stand-in server and reports throughput
+and p50/p99 latency for list, show, create and sub-collection calls,
+then CPU time per row for response processing at growing sizes.
+
+    PYTHONPATH=. python benchmarks/bench_server.py [--latency 0.005] [--threads 8]
+"""
+import argparse
+import json
+import threading
+import time
+from server import Options, Server, make_item
+from tenthousandfeet import TenThousandFeet, HTTPClient, CollectionClient, collections
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(name, fn, calls, threads):
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(xrange(calls))
+
+    def work():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.time()
+            fn(i)
+            elapsed = time.time() - started
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.time()
+    workers = [threading.Thread(target=work) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    total = time.time() - started
+    print '%-28s %7.1f calls/s   p50 %6.1f ms   p99 %6.1f ms' % (
+        name, calls / total, percentile(latencies, 0.5) * 1e3, percentile(latencies, 0.99) * 1e3)
+
+
+class FakeResponse(object):
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def processing(sizes):
+    # CPU per row for get_page on prepared bodies, with no network involved.
+    http = HTTPClient('token', 'http://localhost/')
+    client = CollectionClient(http, 'time_entries', collections['users']['collections']['time_entries']['methods'], {})
+    projects = CollectionClient(http, 'projects', collections['projects']['methods'], {})
+    for name, c in [('time_entries', client), ('projects', projects)]:
+        for size in sizes:
+            body = json.dumps({'data': [make_item(c.methods, i, 100) for i in range(size)]})
+            started = time.clock()
+            c.get_page('list', FakeResponse(body))
+            cpu = time.clock() - started
+            print '%-14s %6d rows   %6.2f us/row' % (name, size, cpu / size * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--calls', type=int, default=400)
+    parser.add_argument('--total', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--payload-size', type=int, default=100)
+    args = parser.parse_args()
+
+    server = Server(Options(args.latency, args.total, args.page_size, args.payload_size)).start()
+    client = TenThousandFeet('token', endpoint=server.url)
+
+    print 'server latency %.1f ms, %d threads, %d rows per list' % (args.latency * 1e3, args.threads, args.total)
+    run('projects.iter_list (all pages)', lambda i: list(client.projects.iter_list()), max(1, args.calls / 20), args.threads)
+    run('projects.list (one page)', lambda i: client.projects.list(), args.calls, args.threads)
+    run('projects.show', lambda i: client.projects.show(i), args.calls, args.threads)
+    run('projects.create', lambda i: client.projects.create(name='Project %d' % i), args.calls, args.threads)
+    run('users.time_entries(id).list', lambda i: client.users.time_entries(i).list(), args.calls, args.threads)
+    print
+    processing([100, 1000, 10000])
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
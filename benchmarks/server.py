@@ -0,0 +1,170 @@
+"""
+A local stand-in for the 10000ft API, shaped after the `collections` spec.
+
+Every collection and sub-collection answers list (paged), show, create,
+update and delete with generated items. Items carry every field named in
+the method's process rules, so date parsing costs what it would against
+the real API.
+
+    PYTHONPATH=. python benchmarks/server.py [--port 8000] [--latency 0.02]
+"""
+import argparse
+import json
+import threading
+import time
+import urlparse
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from tenthousandfeet import collections
+
+
+class Options(object):
+
+    def __init__(self, latency=0.0, total=1000, page_size=100, payload_size=100):
+        self.latency = latency
+        self.total = total
+        self.page_size = page_size
+        self.payload_size = payload_size
+
+
+def find_methods(parts):
+    # Collection names are at even positions in the path, ids at odd ones.
+    desc = {'collections': collections}
+    for name in parts[::2]:
+        desc = desc.get('collections', {}).get(name)
+        if desc is None:
+            return None
+    return desc.get('methods', {})
+
+
+def fake_value(field, i):
+    if field == 'date':
+        return '2014-%02d-%02d' % (i % 12 + 1, i % 28 + 1)
+    return '2014-07-%02dT%02d:%02d:24Z' % (i % 28 + 1, i % 24, i % 60)
+
+
+def make_item(methods, i, payload_size):
+    item = {
+        'id': i,
+        'name': 'Item %d' % i,
+        'user_id': i % 500,
+        'assignable_id': i % 200,
+        'hours': i % 9,
+        'description': 'x' * payload_size
+    }
+    for method in methods.values():
+        for field in method.get('process', {}):
+            item[field.split('.')[0]] = fake_value(field, i)
+    return item
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    pages = {}
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, status, body):
+        text = body if isinstance(body, str) else json.dumps(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(text)))
+        self.end_headers()
+        self.wfile.write(text)
+
+    def route(self, verb):
+        options = self.server.options
+        if options.latency:
+            time.sleep(options.latency)
+        url = urlparse.urlparse(self.path)
+        parts = [p for p in url.path.split('/') if p]
+        methods = find_methods(parts)
+        if methods is None:
+            return self.respond(404, {'message': 'Not found'})
+        length = int(self.headers.get('Content-Length') or 0)
+        form = dict(urlparse.parse_qsl(self.rfile.read(length))) if length else {}
+        # The client sends GET arguments as a form body, so read both.
+        query = dict(urlparse.parse_qsl(url.query), **form)
+        is_item = len(parts) % 2 == 0
+
+        if verb == 'GET' and not is_item:
+            return self.respond(200, self.page(parts, methods, query))
+        elif verb == 'GET':
+            return self.respond(200, {'data': make_item(methods, int(parts[-1]), options.payload_size)})
+        elif verb == 'POST' and not is_item:
+            return self.respond(200, {'data': dict(form, id=options.total + 1)})
+        elif verb == 'PUT' and is_item:
+            return self.respond(200, {'data': dict(form, id=int(parts[-1]))})
+        elif verb == 'DELETE' and is_item:
+            return self.respond(200, {'data': {}})
+        self.respond(405, {'message': 'Method not allowed'})
+
+    def page(self, parts, methods, query):
+        options = self.server.options
+        page = int(query.get('page', 1))
+        per_page = int(query.get('per_page', options.page_size))
+        key = (tuple(parts[::2]), page, per_page)
+        text = self.pages.get(key)
+        if text is None:
+            start = (page - 1) * per_page
+            end = min(options.total, start + per_page)
+            next_url = None
+            if end < options.total:
+                next_url = '/api/v1/%s?page=%d&per_page=%d' % ('/'.join(parts), page + 1, per_page)
+            text = self.pages[key] = json.dumps({
+                'data': [make_item(methods, i, options.payload_size) for i in range(start, end)],
+                'paging': {'page': page, 'per_page': per_page, 'next': next_url}
+            })
+        return text
+
+    def do_GET(self):
+        self.route('GET')
+
+    def do_POST(self):
+        self.route('POST')
+
+    def do_PUT(self):
+        self.route('PUT')
+
+    def do_DELETE(self):
+        self.route('DELETE')
+
+
+class Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, options, port=0):
+        HTTPServer.__init__(self, ('127.0.0.1', port), Handler)
+        self.options = options
+        Handler.pages = {}
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d/' % self.server_address[1]
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--total', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--payload-size', type=int, default=100)
+    args = parser.parse_args()
+    server = Server(Options(args.latency, args.total, args.page_size, args.payload_size), args.port)
+    print 'Serving on %s' % server.url
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,5 +11,6 @@ setup(
     url = 'https://github.com/cooper-software/python-10000ft',
     download_url = 'https://github.com/cooper-software/python-10000ft/tarball/%s' % __version__,
     install_requires = ['requests', 'python-dateutil'],
+    extras_require = {'analytics': ['numpy'], 'speedups': ['ujson']},
     tests_require = ['httmock', 'mock']
 )
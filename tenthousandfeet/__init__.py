@@ -1,9 +1,25 @@
 import requests
 import json
-from datetime import date, datetime
+import hashlib
+from datetime import date, datetime, timedelta
 from dateutil.parser import parse as date_parse
 from functools import partial
-import re
+from collections import namedtuple
+from copy import deepcopy
+from multiprocessing.pool import ThreadPool
+from urlparse import urlparse, parse_qsl
+import time
+import sys
+import threading
+import Queue
+from .scheduler import Scheduler, TokenBucket
+from .cache import ResponseCache, DiskCache, request_key
+from .coalesce import SingleFlight
+from .codec import Codec, get_codec
+from .dates import parse_date
+from .records import Record, RecordFactory
+from .streaming import iter_items
+from .metrics import Metrics
 
 
 TEST_URL = 'http://tenthousandfeettest/'
@@ -12,12 +28,12 @@ PREPROD_URL = 'https://pre-prod-api.10000ft.com/api/v1/'
 PROD_URL = 'https://api.10000ft.com/api/v1/'
 
 project_process_fields = {
-    'created_at': date_parse,
-    'deleted_at': date_parse,
-    'ends_at': date_parse,
-    'secureurl_expiration': date_parse,
-    'starts_at': date_parse,
-    'updated_at': date_parse
+    'created_at': parse_date,
+    'deleted_at': parse_date,
+    'ends_at': parse_date,
+    'secureurl_expiration': parse_date,
+    'starts_at': parse_date,
+    'updated_at': parse_date
 }
 
 project_methods = {
@@ -41,9 +57,9 @@ project_methods = {
 }
 
 user_process_fields = {
-    'deleted_at': date_parse,
-    'hire_date': date_parse,
-    'termination_date': date_parse
+    'deleted_at': parse_date,
+    'hire_date': parse_date,
+    'termination_date': parse_date
 }
 
 time_entries = {
@@ -51,25 +67,25 @@ time_entries = {
         'list': {
             'optional': ['from', 'to', 'with_suggestions'],
             'process': {
-                'date': date_parse
+                'date': parse_date
             }
         },
         'show': {
             'process': {
-                'date': date_parse
+                'date': parse_date
             }
         },
         'create': {
             'required': ['date', 'hours'],
             'optional': ['leave_id', 'project_id', 'assignable_id'],
             'process': {
-                'date': date_parse
+                'date': parse_date
             }
         },
         'update': {
             'optional': ['date', 'hours', 'leave_id', 'project_id', 'assignable_id'],
             'process': {
-                'date': date_parse
+                'date': parse_date
             }
         },
         'delete': {}
@@ -77,19 +93,19 @@ time_entries = {
 }
 
 assignment_process_fields = {
-    'ends_at': date_parse,
-    'starts_at': date_parse
+    'ends_at': parse_date,
+    'starts_at': parse_date
 }
 
 budget_item_process_fields = {
-    'created_at': date_parse,
-    'updated_at': date_parse
+    'created_at': parse_date,
+    'updated_at': parse_date
 }
 
 leave_type_process_fields = {
-    'deleted_at': date_parse,
-    'created_at': date_parse,
-    'updated_at': date_parse
+    'deleted_at': parse_date,
+    'created_at': parse_date,
+    'updated_at': parse_date
 }
 
 tags = {
@@ -164,33 +180,35 @@ collections = {
                 'methods': {
                     'list': {
                         'process': {
-                            'created_at': date_parse,
-                            'updated_at': date_parse
+                            'created_at': parse_date,
+                            'updated_at': parse_date
                         }
                     },
                     'create': {
                         'required': ['status'],
                         'process': {
-                            'created_at': date_parse,
-                            'updated_at': date_parse
+                            'created_at': parse_date,
+                            'updated_at': parse_date
                         }
                     }
                 }
             },
             'time_entries': time_entries,
             'assignments': {
-                'list': {
-                    'optional': ['from', 'to'],
-                    'process': assignment_process_fields
-                },
-                'show': {
-                    'process': assignment_process_fields
-                },
-                'create': {
-                    'optional': ['starts_at', 'ends_at', 'percent', 'fixed_hours'],
-                    'process': assignment_process_fields
-                },
-                'delete': {}
+                'methods': {
+                    'list': {
+                        'optional': ['from', 'to'],
+                        'process': assignment_process_fields
+                    },
+                    'show': {
+                        'process': assignment_process_fields
+                    },
+                    'create': {
+                        'optional': ['starts_at', 'ends_at', 'percent', 'fixed_hours'],
+                        'process': assignment_process_fields
+                    },
+                    'delete': {}
+                }
             },
             'tags': tags
         }
@@ -218,28 +236,89 @@ class Error(Exception):
 
 class HTTPClient(object):
     
-    def __init__(self, token, endpoint):
+    hook_names = ('before_request', 'after_response', 'retry', 'before_call', 'after_call', 'processed')
+    
+    # One client can be shared by any number of threads: requests' 
+    # connection pool is thread safe, and the scheduler and cache lock 
+    # their own state. Hooks should be added before the client is shared.
+    
+    def __init__(self, token, endpoint, scheduler=None, cache=None, session=None, 
+                 pool_size=10, pool_block=False, keep_alive=True, timeout=None, compress=True,
+                 coalesce=False, codec=None):
         self.token = token
         self.endpoint = endpoint
-        self.session = requests.Session()
+        self.scheduler = scheduler
+        self.cache = cache
+        self.flights = SingleFlight() if coalesce else None
+        self.codec = get_codec(codec)
+        # Cache keys start with the endpoint and a digest of the token, so 
+        # a cache shared by several clients never mixes up their results.
+        digest = hashlib.sha1(token.encode('utf-8') if isinstance(token, unicode) else token)
+        self.cache_scope = '%s %s ' % (endpoint, digest.hexdigest()[:16])
+        self.timeout = timeout
+        self.hooks = dict((name, []) for name in self.hook_names)
+        # Anything with requests.Session's get/post/put/delete will do, 
+        # such as tenthousandfeet.fake.FakeAPI.
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size, pool_block=pool_block)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
         self.session.headers['auth'] = token
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate' if compress else 'identity'
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
         
-    def request(self, method, path, data):
-        res = method(self.endpoint + path, data=data)
-        if res.status_code not in (200, 201):
+    def add_hook(self, name, fn):
+        self.hooks[name].append(fn)
+        
+    def fire(self, name, **info):
+        for fn in self.hooks[name]:
+            fn(**info)
+        
+    def request(self, method, path, data, idempotent=True, headers=None, stream=False):
+        kwargs = {'data': data}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        if headers:
+            kwargs['headers'] = headers
+        if stream:
+            kwargs['stream'] = True
+        url = self.endpoint + path
+        verb = getattr(method, '__name__', 'request').upper()
+        
+        def send():
+            if self.hooks['before_request']:
+                self.fire('before_request', method=verb, url=url, data=data)
+            started = time.time()
+            res = method(url, **kwargs)
+            if self.hooks['after_response']:
+                self.fire('after_response', method=verb, url=url, data=data, response=res, 
+                          elapsed=time.time() - started, stream=stream)
+            return res
+        
+        if self.scheduler is None:
+            res = send()
+        else:
+            on_retry = partial(self.fire, 'retry', method=verb, url=url) if self.hooks['retry'] else None
+            res = self.scheduler.call(send, idempotent, on_retry)
+        if res.status_code == 304 and headers:
+            return res
+        elif res.status_code not in (200, 201):
             try:
-                message = res.json()['message']
+                message = self.codec.decode(res)['message']
             except:
                 message = res.reason
             raise Error(res.status_code, message)
         else:
             return res
         
-    def get(self, path='', data=None):
-        return self.request(self.session.get, path, data)
+    def get(self, path='', data=None, headers=None, stream=False):
+        return self.request(self.session.get, path, data, headers=headers, stream=stream)
         
     def post(self, path='', data=None):
-        return self.request(self.session.post, path, data)
+        return self.request(self.session.post, path, data, idempotent=False)
         
     def put(self, path='', data=None):
         return self.request(self.session.put, path, data)
@@ -248,38 +327,385 @@ class HTTPClient(object):
         return self.request(self.session.delete, path, data)
 
 
+class MethodSpec(object):
+    
+    # A method description from `collections`, compiled once so requests
+    # don't rebuild argument sets or split process keys.
+    
+    def __init__(self, desc):
+        self.optional = frozenset(desc.get('optional', []))
+        self.required = frozenset(desc.get('required', []))
+        self.allowed = self.optional | self.required
+        rules = desc.get('process', {})
+        self.rules = tuple((k, fn) for k,fn in rules.items() if '.' not in k)
+        self.nested_rules = tuple((tuple(k.split('.')), fn) for k,fn in rules.items() if '.' in k)
+        self.record = RecordFactory(self.decoders())
+        
+    def decoders(self):
+        decoders = dict(self.rules)
+        nested = {}
+        for parts,fn in self.nested_rules:
+            nested.setdefault(parts[0], {})['.'.join(parts[1:])] = fn
+        for k,rules in nested.items():
+            decoders[k] = partial(decode_nested, decoders.get(k), MethodSpec({'process': rules}))
+        return decoders
+        
+    def process(self, item):
+        for k,fn in self.rules:
+            value = item.get(k)
+            if value is not None:
+                item[k] = fn(value)
+        for parts,fn in self.nested_rules:
+            try:
+                parent = get_in_dict(item, parts[:-1])
+                value = parent[parts[-1]]
+            except KeyError:
+                continue
+            if value is not None:
+                parent[parts[-1]] = fn(value)
+        return item
+        
+    def process_many(self, items):
+        if self.nested_rules:
+            for item in items:
+                self.process(item)
+        elif self.rules:
+            rules = self.rules
+            for item in items:
+                for k,fn in rules:
+                    value = item.get(k)
+                    if value is not None:
+                        item[k] = fn(value)
+        return items
+
+
+def decode_nested(fn, spec, value):
+    if fn is not None:
+        value = fn(value)
+    if isinstance(value, list):
+        return spec.process_many(value)
+    elif isinstance(value, dict):
+        return spec.process(value)
+    return value
+
+
+def compile_methods(methods):
+    return dict((name, MethodSpec(desc)) for name, desc in methods.items())
+
+
+BulkResult = namedtuple('BulkResult', ['row', 'result', 'error'])
+Change = namedtuple('Change', ['type', 'id', 'item'])
+
+
 class CollectionClient(object):
     
-    underscore_replace_pattern = re.compile('^(_+)')
+    # Creates are only retried when the server has refused them outright, 
+    # since any other failure may have happened after the object was made.
+    bulk_retry_statuses = {
+        'create': (429,),
+        'update': (429, 502, 503, 504),
+        'delete': (429, 502, 503, 504)
+    }
+    bulk_retry_delay = 0.5
+    stream_chunk_size = 64 * 1024
+    watch_per_page = 1000
+    sub_collection_cache_size = 16384
     
-    def __init__(self, http, name, methods, collections):
+    def __init__(self, http, name, methods, collections, specs=None, records=False):
         self.name = name
         self.http = http
         self.methods = methods
+        self.specs = specs if specs is not None else compile_methods(methods)
+        self.records = records
+        self.collections = collections
+        self.kind = '.'.join(name.split('/')[::2])
+        
         
-        for subname, collection in collections.items():
-            setattr(self, subname, self.create_sub_collection_factory(subname, collection))
+    def __getattr__(self, name):
+        # Sub-collection factories are only built when first used.
+        desc = self.__dict__.get('collections', {}).get(name)
+        if desc is None:
+            raise AttributeError("%r object has no attribute %r" % (self.__class__.__name__, name))
+        factory = self.create_sub_collection_factory(name, desc)
+        setattr(self, name, factory)
+        return factory
         
         
     def create_sub_collection_factory(self, name, desc):
+        methods = desc.get('methods', {})
+        collections = desc.get('collections', {})
+        specs = compile_methods(methods)
+        clients = {}
         def factory(object_id):
-            return CollectionClient(
-                        self.http, 
-                        '%s/%s/%s' % (self.name, object_id, name),
-                        desc.get('methods', {}),
-                        desc.get('collections', {})
-                    )
+            path = '%s/%s/%s' % (self.name, object_id, name)
+            client = clients.get(path)
+            if client is None:
+                # Clients hold no per-request state, so when the cache is
+                # full an arbitrary one is dropped rather than tracking use.
+                if len(clients) >= self.sub_collection_cache_size:
+                    try:
+                        clients.popitem()
+                    except KeyError:
+                        pass
+                client = self.__class__(self.http, path, methods, collections, specs, self.records)
+                clients[path] = client
+            return client
+        factory.clients = clients
         return factory
         
         
-    def list(self, **kwargs):
+    def list(self, prefetch=None, prefetch_concurrency=8, **kwargs):
+        if prefetch:
+            self.require_method('list')
+            data = self.check_kwargs('list', kwargs)
+            return self.list_prefetched(data, prefetch, prefetch_concurrency)
         return self.request(self.http.get, 'list', '', kwargs)
         
         
+    def list_prefetched(self, data, names, concurrency):
+        items = self.send(self.http.get, 'list', '', data)
+        return self.prefetch(items, names, concurrency)
+        
+        
+    def prefetch(self, items, names, concurrency=8):
+        # Lists the named sub-collections of every item concurrently and 
+        # attaches them to the item under the sub-collection's name. A fetch
+        # that fails is attached as its error and the others still run.
+        if not isinstance(names, dict):
+            names = dict((name, {}) for name in names)
+        if not items:
+            return items
+        checked = {}
+        for name, kwargs in names.items():
+            if name not in self.collections:
+                raise Exception, "%s has no sub-collection %s" % (self.name, name)
+            client = getattr(self, name)(items[0]['id'])
+            client.require_method('list')
+            checked[name] = client.check_kwargs('list', kwargs)
+        
+        jobs = [(i, name, item['id']) for i, item in enumerate(items) for name in checked]
+        fetched = [{} for item in items]
+        fn = partial(self.prefetch_one, checked)
+        for i, name, children in imap_concurrently(fn, jobs, concurrency, ordered=False):
+            fetched[i][name] = children
+        return [self.attach(item, children) for item, children in zip(items, fetched)]
+        
+        
+    def prefetch_one(self, checked, job):
+        i, name, object_id = job
+        client = getattr(self, name)(object_id)
+        try:
+            return i, name, list(client.iter_pages(checked[name]))
+        except (Error, requests.RequestException), e:
+            return i, name, e
+        
+        
+    def attach(self, item, children):
+        if isinstance(item, Record):
+            return self.specs['list'].record.extend(item, children)
+        item.update(children)
+        return item
+        
+        
+    def iter_list(self, **kwargs):
+        self.require_method('list')
+        return self.iter_pages(self.check_kwargs('list', kwargs))
+        
+        
+    def iter_pages(self, data):
+        # Items are yielded one page at a time while the next page is
+        # fetched in the background.
+        pending = Background(self.fetch_page, data)
+        while pending is not None:
+            items, paging = pending.get()
+            next_url = paging.get('next')
+            if items and next_url:
+                data = dict(data, **dict(parse_qsl(urlparse(next_url).query)))
+                pending = Background(self.fetch_page, data)
+            else:
+                pending = None
+            for item in items or []:
+                yield item
+        
+        
+    def stream_list(self, **kwargs):
+        self.require_method('list')
+        return self.stream_pages(self.check_kwargs('list', kwargs))
+        
+        
+    def stream_pages(self, data):
+        # Items are decoded from the response as it arrives, so only one
+        # item at a time is held in memory.
+        while data is not None:
+            body = {}
+            count = 0
+            for item in self.stream_page(data, body):
+                count += 1
+                yield item
+            next_url = (body.get('paging') or {}).get('next')
+            if count and next_url:
+                data = dict(data, **dict(parse_qsl(urlparse(next_url).query)))
+            else:
+                data = None
+        
+        
+    def stream_page(self, data, body):
+        # Fires the same hooks as other calls. Elapsed and processing times
+        # only count time spent in the client, not time the caller spends 
+        # between items.
+        hooks = self.http.hooks
+        watched = hooks['before_call'] or hooks['after_call']
+        if watched:
+            self.http.fire('before_call', collection=self.kind, method='list', path='', data=data)
+        requested = time.time()
+        elapsed = None
+        decode_time = process_time = 0
+        count = 0
+        error = None
+        try:
+            res = self.http.get(path=self.name + '/', data=data, stream=True)
+            elapsed = time.time() - requested
+            try:
+                items = iter_items(res.iter_content(self.stream_chunk_size), 'data', body)
+                while True:
+                    started = time.time()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    decoded = time.time()
+                    item = self.process_response_data('list', item)
+                    decode_time += decoded - started
+                    process_time += time.time() - decoded
+                    count += 1
+                    yield item
+            finally:
+                res.close()
+        except Exception, e:
+            error = e
+            raise
+        finally:
+            if elapsed is None:
+                elapsed = time.time() - requested
+            if watched:
+                self.http.fire('after_call', collection=self.kind, method='list', 
+                               elapsed=elapsed + decode_time + process_time, error=error)
+        if hooks['processed']:
+            self.http.fire('processed', collection=self.kind, method='list', 
+                           decode_time=decode_time, process_time=process_time, count=count)
+        
+        
+    def watch(self, interval=60, min_interval=5, max_interval=600, initial=False, 
+              polls=None, sleep=time.sleep, **kwargs):
+        # The API can't filter by updated_at, so each poll lists everything
+        # and compares it with the last poll by id and updated_at. The 
+        # interval halves after a poll with changes and grows by half after
+        # one without. Archived projects are listed so that archiving shows
+        # up as an update rather than a deletion.
+        self.require_method('list')
+        if 'with_archived' in self.specs['list'].allowed:
+            kwargs.setdefault('with_archived', True)
+        kwargs.setdefault('per_page', self.watch_per_page)
+        data = self.check_kwargs('list', kwargs)
+        known = None
+        count = 0
+        while polls is None or count < polls:
+            if count:
+                sleep(interval)
+            count += 1
+            current = {}
+            changes = []
+            for item in self.iter_pages(data):
+                object_id = item.get('id')
+                version = self.version(item)
+                current[object_id] = version
+                if known is None:
+                    if initial:
+                        changes.append(Change('created', object_id, item))
+                elif object_id not in known:
+                    changes.append(Change('created', object_id, item))
+                elif known[object_id] != version:
+                    changes.append(Change('updated', object_id, item))
+            if known is not None:
+                for object_id in known:
+                    if object_id not in current:
+                        changes.append(Change('deleted', object_id, None))
+                if changes:
+                    interval = max(min_interval, interval / 2.0)
+                else:
+                    interval = min(max_interval, interval * 1.5)
+            known = current
+            for change in changes:
+                yield change
+        
+        
+    def version(self, item):
+        updated_at = item.get('updated_at')
+        if updated_at is not None:
+            return updated_at
+        # Without updated_at, any change to the item counts.
+        if isinstance(item, Record):
+            item = item.to_dict()
+        return json.dumps(item, sort_keys=True, default=self.serialize_arg)
+        
+        
+    def iter_windows(self, start, end, window=30, concurrency=4, target_rows=1000, **kwargs):
+        # Splits [start, end] into windows of `window` days that are listed
+        # concurrently and yielded in date order. Items in more than one
+        # window, such as long assignments, are only yielded once.
+        self.require_method('list')
+        spec = self.specs['list']
+        assert 'from' in spec.allowed and 'to' in spec.allowed, \
+            "%s.list does not take from and to" % self.name
+        data = self.check_kwargs('list', kwargs)
+        windows = Windows(start, end, window, target_rows)
+        fetch = partial(self.fetch_window, data, windows)
+        seen = set()
+        for items in imap_concurrently(fetch, windows, concurrency):
+            for item in items:
+                object_id = item.get('id')
+                if object_id is not None:
+                    if object_id in seen:
+                        continue
+                    seen.add(object_id)
+                yield item
+        
+        
+    def fetch_window(self, data, windows, window):
+        first, last = window
+        data = dict(data, **{'from': self.serialize_arg(first), 'to': self.serialize_arg(last)})
+        items = list(self.iter_pages(data))
+        windows.observe(len(items))
+        return items
+        
+        
+    def fetch_page(self, data):
+        return self.call('list', '', data, partial(self.get_list_page, data))
+        
+        
+    def get_list_page(self, data):
+        res = self.http.get(path=self.name + '/', data=data)
+        return self.get_page('list', res)
+        
+        
     def show(self, object_id, **kwargs):
         return self.request(self.http.get, 'show', object_id, kwargs)
         
         
+    def show_many(self, object_ids, ordered=True, concurrency=8, **kwargs):
+        self.require_method('show')
+        data = self.check_kwargs('show', kwargs)
+        return imap_concurrently(partial(self.show_one, data), object_ids, 
+                                 concurrency, ordered)
+        
+        
+    def show_one(self, data, object_id):
+        try:
+            return object_id, self.send(self.http.get, 'show', object_id, data)
+        except (Error, requests.RequestException), e:
+            return object_id, e
+        
+        
     def create(self, **kwargs):
         return self.request(self.http.post, 'create', '', kwargs)
         
@@ -292,38 +718,172 @@ class CollectionClient(object):
         return self.request(self.http.delete, 'delete', object_id, kwargs)
         
         
+    def bulk_create(self, rows, concurrency=8, retries=2):
+        jobs = [(row, '', row) for row in rows]
+        return self.bulk(self.http.post, 'create', jobs, concurrency, retries)
+        
+        
+    def bulk_update(self, rows, concurrency=8, retries=2):
+        jobs = [(row, row.get('id'), dict((k, v) for k,v in row.items() if k != 'id')) for row in rows]
+        return self.bulk(self.http.put, 'update', jobs, concurrency, retries)
+        
+        
+    def bulk_delete(self, object_ids, concurrency=8, retries=2):
+        jobs = [(object_id, object_id, {}) for object_id in object_ids]
+        return self.bulk(self.http.delete, 'delete', jobs, concurrency, retries)
+        
+        
+    def bulk(self, http_fn, method, jobs, concurrency, retries):
+        self.require_method(method)
+        checked = []
+        for i, (row, path, kwargs) in enumerate(jobs):
+            try:
+                assert path is not None, "id is required to %s %s" % (method, self.name)
+                checked.append((row, path, self.validate_kwargs(method, kwargs)))
+            except AssertionError, e:
+                raise AssertionError("row %d: %s" % (i, e))
+        fn = partial(self.send_with_retries, http_fn, method, retries)
+        return list(imap_concurrently(fn, checked, concurrency))
+        
+        
+    def send_with_retries(self, http_fn, method, retries, job):
+        row, path, data = job
+        attempt = 0
+        while True:
+            try:
+                return BulkResult(row, self.send(http_fn, method, path, data), None)
+            except Error, e:
+                if attempt >= retries or e.status_code not in self.bulk_retry_statuses[method]:
+                    return BulkResult(row, None, e)
+            except requests.RequestException, e:
+                if attempt >= retries or method == 'create':
+                    return BulkResult(row, None, e)
+            attempt += 1
+            time.sleep(self.bulk_retry_delay * 2 ** (attempt - 1))
+        
+        
     def request(self, http_fn, method, path, kwargs):
         self.require_method(method)
         data = self.check_kwargs(method, kwargs)
+        return self.send(http_fn, method, path, data)
+        
+        
+    def send(self, http_fn, method, path, data):
+        return self.call(method, path, data, partial(self.dispatch, http_fn, method, path, data))
+        
+        
+    def call(self, method, path, data, fn):
+        hooks = self.http.hooks
+        if not hooks['before_call'] and not hooks['after_call']:
+            return fn()
+        
+        self.http.fire('before_call', collection=self.kind, method=method, path=path, data=data)
+        started = time.time()
+        error = None
+        try:
+            return fn()
+        except Exception, e:
+            error = e
+            raise
+        finally:
+            self.http.fire('after_call', collection=self.kind, method=method, 
+                           elapsed=time.time() - started, error=error)
+        
+        
+    def dispatch(self, http_fn, method, path, data):
         if not isinstance(path, basestring):
             path = str(path)
-        res = http_fn(path=self.name + '/' + path, data=data)
+        path = self.name + '/' + path
+        flights = self.http.flights
+        if flights is not None and method in ('list', 'show'):
+            fetch = partial(self.fetch, http_fn, method, path, data)
+            return flights.do(request_key(path, data), fetch)
+        return self.fetch(http_fn, method, path, data)
+        
+        
+    def fetch(self, http_fn, method, path, data):
+        cache = self.http.cache
+        if cache is None:
+            res = http_fn(path=path, data=data)
+        elif method in ('list', 'show'):
+            return self.send_cached(cache, http_fn, method, path, data)
+        else:
+            try:
+                res = http_fn(path=path, data=data)
+            finally:
+                cache.invalidate(self.http.cache_scope + self.name + '/')
         return self.get_response(method, res)
         
         
+    def send_cached(self, cache, http_fn, method, path, data):
+        key = cache.key(self.http.cache_scope + path, data)
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry):
+            return self.get_cached(cache, method, entry)
+        
+        headers = entry.validators() if entry is not None else None
+        if headers:
+            res = http_fn(path=path, data=data, headers=headers)
+        else:
+            res = http_fn(path=path, data=data)
+        
+        collection = self.name.rsplit('/', 1)[-1]
+        if res.status_code == 304:
+            cache.refresh(key, entry, collection)
+            return self.get_cached(cache, method, entry)
+        
+        etag, last_modified = res.headers.get('ETag'), res.headers.get('Last-Modified')
+        if not cache.stores_body:
+            value = self.get_response(method, res)
+            cache.set(key, deepcopy(value), collection, etag, last_modified)
+            return value
+        
+        # Caches outside the process hold the response body as JSON and
+        # process it again on every hit.
+        started = time.time()
+        body = self.http.codec.decode(res)
+        cache.set(key, self.http.codec.dumps(body), collection, etag, last_modified)
+        return self.process_body(method, body, time.time() - started)[0]
+        
+        
+    def get_cached(self, cache, method, entry):
+        if not cache.stores_body:
+            return deepcopy(entry.value)
+        started = time.time()
+        body = self.http.codec.loads(entry.value)
+        return self.process_body(method, body, time.time() - started)[0]
+        
+        
     def get_response(self, method, res):
-        data = res.json().get('data')
-        self.process_response_data(method, data)
-        return data
+        return self.get_page(method, res)[0]
         
         
-    def process_response_data(self, method, data):
-        process_rules = self.methods[method].get('process', {})
-        if isinstance(data, list):
-            return map(partial(self.process_response_data_item, process_rules), data)
-        else:
-            return self.process_response_data_item(process_rules, data)
+    def get_page(self, method, res):
+        started = time.time()
+        body = self.http.codec.decode(res)
+        return self.process_body(method, body, time.time() - started)
         
         
-    def process_response_data_item(self, process_rules, data):
-        for k,fn in process_rules.items():
-            parts = k.split('.')
-            try:
-                value = get_in_dict(data, parts)
-            except KeyError:
-                continue
-            if value is not None:
-                set_in_dict(data, parts, fn(value))
+    def process_body(self, method, body, decode_time):
+        started = time.time()
+        data = self.process_response_data(method, body.get('data'))
+        if self.http.hooks['processed']:
+            self.http.fire('processed', collection=self.kind, method=method, 
+                           decode_time=decode_time, process_time=time.time() - started,
+                           count=len(data) if isinstance(data, list) else 1)
+        return data, body.get('paging') or {}
+        
+        
+    def process_response_data(self, method, data):
+        spec = self.specs[method]
+        if self.records:
+            if isinstance(data, list):
+                return map(spec.record, data)
+            return spec.record(data)
+        if isinstance(data, list):
+            return spec.process_many(data)
+        elif data is not None:
+            return spec.process(data)
         return data
         
         
@@ -333,22 +893,28 @@ class CollectionClient(object):
         
         
     def check_kwargs(self, method, kwargs):
-        method_desc = self.methods[method]
-        optional = set(method_desc.get('optional', []))
-        required = set(method_desc.get('required', []))
+        spec = self.specs[method]
         new_kwargs = {}
+        serialize_arg = self.serialize_arg
         
         for k,v in kwargs.items():
-            k = self.underscore_replace_pattern.sub('', k)
-            new_kwargs[k] = self.serialize_arg(v)
+            new_kwargs[k.lstrip('_')] = serialize_arg(v)
         
-        for r in required:
-            assert r in kwargs, "%s is a required argument of %s.%s" % (r, self.name, method)
+        for r in spec.required:
+            assert r in new_kwargs, "%s is a required argument of %s.%s" % (r, self.name, method)
         
         return new_kwargs
         
         
-    def serialize_arg(self, value):
+    def validate_kwargs(self, method, kwargs):
+        data = self.check_kwargs(method, kwargs)
+        unknown = sorted(set(data) - self.specs[method].allowed)
+        assert not unknown, "%s not an argument of %s.%s" % (', '.join(unknown), self.name, method)
+        return data
+        
+        
+    @staticmethod
+    def serialize_arg(value):
         if isinstance(value, datetime):
             return value.strftime('%Y-%m-%dT%H:%M:%S%z')
         elif isinstance(value, date):
@@ -357,6 +923,116 @@ class CollectionClient(object):
             return value
 
 
+class Windows(object):
+    
+    # Consecutive date windows covering [start, end]. Windows that come back
+    # with more than target_rows items halve the size of the ones not yet
+    # handed out, and ones with under a quarter of that double it.
+    
+    def __init__(self, start, end, days, target_rows, min_days=1, max_days=366):
+        self.start = start.date() if isinstance(start, datetime) else start
+        self.end = end.date() if isinstance(end, datetime) else end
+        self.days = days
+        self.target_rows = target_rows
+        self.min_days = min_days
+        self.max_days = max_days
+        
+    def __iter__(self):
+        first = self.start
+        while first <= self.end:
+            last = min(self.end, first + timedelta(days=self.days - 1))
+            yield first, last
+            first = last + timedelta(days=1)
+            
+    def observe(self, rows):
+        if rows > self.target_rows:
+            self.days = max(self.min_days, self.days // 2)
+        elif rows * 4 < self.target_rows:
+            self.days = min(self.max_days, self.days * 2)
+
+
+class Background(object):
+    
+    def __init__(self, fn, *args):
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, args=(fn, args))
+        self.thread.daemon = True
+        self.thread.start()
+        
+    def run(self, fn, args):
+        try:
+            self.result = fn(*args)
+        except BaseException:
+            self.error = sys.exc_info()
+            
+    def get(self):
+        self.thread.join()
+        if self.error:
+            raise self.error[0], self.error[1], self.error[2]
+        return self.result
+
+
+def imap_concurrently(fn, items, concurrency, ordered=True):
+    # Checked here rather than in the generator, so a bad argument raises
+    # when the call is made.
+    assert concurrency >= 1, "concurrency must be at least 1, not %r" % (concurrency,)
+    return iter_concurrently(fn, items, concurrency, ordered)
+
+
+def iter_concurrently(fn, items, concurrency, ordered):
+    # Plain threads rather than a ThreadPool, which takes around 100ms to 
+    # shut down and would dominate small batches.
+    items = enumerate(items)
+    lock = threading.Lock()
+    results = Queue.Queue()
+    stopped = []
+    
+    def work():
+        while not stopped:
+            with lock:
+                try:
+                    i, item = next(items)
+                except StopIteration:
+                    break
+                except BaseException:
+                    # The input failed, which is passed on to the consumer.
+                    results.put((None, None, sys.exc_info()))
+                    break
+            try:
+                results.put((i, fn(item), None))
+            except BaseException:
+                results.put((i, None, sys.exc_info()))
+        results.put(None)
+    
+    workers = [threading.Thread(target=work) for i in range(concurrency)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+    
+    try:
+        finished = 0
+        waiting = {}
+        next_index = 0
+        while finished < len(workers):
+            result = results.get()
+            if result is None:
+                finished += 1
+                continue
+            i, value, error = result
+            if error:
+                raise error[0], error[1], error[2]
+            if not ordered:
+                yield value
+                continue
+            waiting[i] = value
+            while next_index in waiting:
+                yield waiting.pop(next_index)
+                next_index += 1
+    finally:
+        stopped.append(True)
+
+
 def get_in_dict(dict, key):
     return reduce(lambda d, k: d[k], key, dict)
     
@@ -368,14 +1044,64 @@ def set_in_dict(dict, key, value):
 
 class TenThousandFeet(object):
     
-    def __init__(self, token, endpoint=PROD_URL):
-        http = HTTPClient(token, endpoint)
-        for name, desc in collections.items():
-            setattr(self, name, 
-                CollectionClient(
-                    http,
+    http_class = HTTPClient
+    collection_class = CollectionClient
+    
+    def __init__(self, token, endpoint=PROD_URL, records=False, **http_kwargs):
+        self.http = self.http_class(token, endpoint, **http_kwargs)
+        self.records = records
+        
+    def __getattr__(self, name):
+        # Collection clients are only built when first used.
+        desc = collections.get(name)
+        if desc is None or 'http' not in self.__dict__:
+            raise AttributeError("%r object has no attribute %r" % (self.__class__.__name__, name))
+        client = self.collection_class(
+                    self.http,
                     name, 
                     desc.get('methods', {}), 
-                    desc.get('collections', {})
-                ))
-            
\ No newline at end of file
+                    desc.get('collections', {}),
+                    records=self.records
+                )
+        setattr(self, name, client)
+        return client
+
+
+class AsyncHTTPClient(HTTPClient):
+    
+    def __init__(self, token, endpoint, concurrency=10, **kwargs):
+        kwargs.setdefault('pool_size', concurrency)
+        super(AsyncHTTPClient, self).__init__(token, endpoint, **kwargs)
+        self.concurrency = concurrency
+        self.pool = ThreadPool(concurrency)
+        
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+class AsyncCollectionClient(CollectionClient):
+    
+    def request(self, http_fn, method, path, kwargs):
+        # Arguments are checked on the calling thread so mistakes surface
+        # immediately rather than from the returned result.
+        self.require_method(method)
+        data = self.check_kwargs(method, kwargs)
+        return self.http.pool.apply_async(self.send, (http_fn, method, path, data))
+    
+    
+    def list(self, prefetch=None, prefetch_concurrency=8, **kwargs):
+        if not prefetch:
+            return self.request(self.http.get, 'list', '', kwargs)
+        self.require_method('list')
+        data = self.check_kwargs('list', kwargs)
+        return self.http.pool.apply_async(self.list_prefetched, (data, prefetch, prefetch_concurrency))
+
+
+class AsyncTenThousandFeet(TenThousandFeet):
+    
+    http_class = AsyncHTTPClient
+    collection_class = AsyncCollectionClient
+    
+    def close(self):
+        self.http.close()
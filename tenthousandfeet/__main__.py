@@ -0,0 +1,15 @@
+import argparse
+import sys
+from tenthousandfeet import export
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tenthousandfeet')
+    commands = parser.add_subparsers(title='commands')
+    export.configure(commands.add_parser('export', help='stream a collection to NDJSON or CSV'))
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
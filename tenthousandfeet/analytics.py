@@ -0,0 +1,162 @@
+from datetime import date, datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("tenthousandfeet.analytics requires numpy (pip install tenthousandfeet[analytics])")
+
+
+def to_day(value):
+    if value is None:
+        return 'NaT'
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return value[:10]
+
+
+def day_array(values):
+    return np.array([to_day(v) for v in values], dtype='datetime64[D]')
+
+
+def week_start(days):
+    # 1970-01-01 was a Thursday, so Monday is three days before each
+    # multiple of seven from the epoch.
+    numbers = days.astype('int64')
+    return (numbers - (numbers + 3) % 7).astype('datetime64[D]')
+
+
+def encode(values):
+    labels, codes = np.unique(np.asarray(values), return_inverse=True)
+    return labels, codes
+
+
+class Index(object):
+
+    # Row positions grouped by code, so the rows for one label are a slice.
+
+    def __init__(self, labels, codes):
+        self.labels = labels
+        self.order = np.argsort(codes, kind='mergesort')
+        counts = np.bincount(codes, minlength=len(labels))
+        self.bounds = np.concatenate([[0], np.cumsum(counts)])
+
+    def rows(self, label):
+        i = np.searchsorted(self.labels, label)
+        if i == len(self.labels) or self.labels[i] != label:
+            return np.array([], dtype='int64')
+        return self.order[self.bounds[i]:self.bounds[i + 1]]
+
+
+class TimeEntries(object):
+
+    def __init__(self, rows):
+        require_numpy()
+        rows = list(rows)
+        self.ids = np.array([row.get('id') for row in rows])
+        self.dates = day_array(row.get('date') for row in rows)
+        self.hours = np.array([row.get('hours') or 0 for row in rows], dtype='float64')
+        self.users, self.user_codes = encode([row.get('user_id') or 0 for row in rows])
+        self.projects, self.project_codes = encode([row.get('assignable_id') or row.get('project_id') or 0 for row in rows])
+        self.by_user = Index(self.users, self.user_codes)
+        self.by_project = Index(self.projects, self.project_codes)
+        self.by_date = np.argsort(self.dates, kind='mergesort')
+        self.sorted_dates = self.dates[self.by_date]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def select(self, user_id=None, project_id=None, start=None, end=None):
+        selections = []
+        if user_id is not None:
+            selections.append(self.by_user.rows(user_id))
+        if project_id is not None:
+            selections.append(self.by_project.rows(project_id))
+        if start is not None or end is not None:
+            selections.append(self.rows_between(start, end))
+        mask = np.ones(len(self), dtype=bool)
+        for rows in selections:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[rows] = True
+            mask &= selected
+        return np.nonzero(mask)[0]
+
+    def rows_between(self, start=None, end=None):
+        lo = np.searchsorted(self.sorted_dates, np.datetime64(to_day(start), 'D')) if start is not None else 0
+        hi = np.searchsorted(self.sorted_dates, np.datetime64(to_day(end), 'D'), side='right') if end is not None else len(self)
+        return self.by_date[lo:hi]
+
+    def hours_by_user(self):
+        return self.users, np.bincount(self.user_codes, weights=self.hours, minlength=len(self.users))
+
+    def hours_by_project(self):
+        return self.projects, np.bincount(self.project_codes, weights=self.hours, minlength=len(self.projects))
+
+    def hours_by_project_week(self):
+        weeks, week_codes = encode(week_start(self.dates))
+        cells = self.project_codes * len(weeks) + week_codes
+        totals = np.bincount(cells, weights=self.hours, minlength=len(self.projects) * len(weeks))
+        return self.projects, weeks, totals.reshape(len(self.projects), len(weeks))
+
+    def utilization(self, start, end, hours_per_day=8):
+        rows = self.rows_between(start, end)
+        hours = np.bincount(self.user_codes[rows], weights=self.hours[rows], minlength=len(self.users))
+        end = np.datetime64(to_day(end), 'D') + 1
+        capacity = np.busday_count(np.datetime64(to_day(start), 'D'), end) * hours_per_day
+        return self.users, hours / capacity if capacity else np.zeros(len(self.users))
+
+    def budget_burn(self, budget_items, item_type):
+        budgets = {}
+        for item in budget_items:
+            if item.get('item_type') == item_type:
+                project_id = item.get('assignable_id') or item.get('project_id')
+                budgets[project_id] = budgets.get(project_id, 0) + (item.get('amount') or 0)
+        projects, hours = self.hours_by_project()
+        budget = np.array([budgets.get(p, 0) for p in projects.tolist()], dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            burn = np.where(budget > 0, hours / budget, np.nan)
+        return projects, hours, budget, burn
+
+
+class Assignments(object):
+
+    def __init__(self, rows, user_id=None):
+        require_numpy()
+        rows = list(rows)
+        self.ids = np.array([row.get('id') for row in rows])
+        self.starts = day_array(row.get('starts_at') for row in rows)
+        self.ends = day_array(row.get('ends_at') for row in rows)
+        self.percent = np.array([row.get('percent') or 0 for row in rows], dtype='float64')
+        self.fixed_hours = np.array([row.get('fixed_hours') or 0 for row in rows], dtype='float64')
+        self.users, self.user_codes = encode([row.get('user_id') or user_id or 0 for row in rows])
+        self.projects, self.project_codes = encode([row.get('assignable_id') or 0 for row in rows])
+        self.by_user = Index(self.users, self.user_codes)
+        self.by_project = Index(self.projects, self.project_codes)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scheduled_hours(self, start, end, hours_per_day=8):
+        # Hours each assignment contributes to the working days it overlaps
+        # in [start, end]: fixed hours are spread evenly over the whole
+        # assignment, otherwise percent of a full day.
+        start = np.datetime64(to_day(start), 'D')
+        end = np.datetime64(to_day(end), 'D') + 1
+        lo = np.maximum(self.starts, start)
+        hi = np.maximum(np.minimum(self.ends + 1, end), lo)
+        overlap = np.busday_count(lo, hi)
+        length = np.busday_count(self.starts, np.maximum(self.ends + 1, self.starts))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fixed = np.where(length > 0, self.fixed_hours * overlap / length, 0)
+        hours = np.where(self.fixed_hours > 0, fixed, overlap * hours_per_day * self.percent)
+        return hours
+
+    def scheduled_hours_by_user(self, start, end, hours_per_day=8):
+        hours = self.scheduled_hours(start, end, hours_per_day)
+        return self.users, np.bincount(self.user_codes, weights=hours, minlength=len(self.users))
@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.items.pop(key)
+            except KeyError:
+                return default
+            self.items[key] = value
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = value
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self.lock:
+            return self.items.pop(key, default)
+
+    def keys(self):
+        with self.lock:
+            return list(self.items.keys())
+
+    def __len__(self):
+        return len(self.items)
+
+
+class CacheEntry(object):
+
+    def __init__(self, value, etag, last_modified, expires):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache(object):
+
+    # Holds processed results, so a hit or a 304 costs a copy rather than
+    # decoding and date parsing.
+    stores_body = False
+
+    def __init__(self, max_size=1000, ttl=60, ttls=None, clock=time.time):
+        self.entries = LRUCache(max_size)
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.clock = clock
+
+    def key(self, path, data):
+        return request_key(path, data)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def is_fresh(self, entry):
+        return self.clock() < entry.expires
+
+    def expires(self, collection):
+        return self.clock() + self.ttls.get(collection, self.ttl)
+
+    def set(self, key, value, collection, etag=None, last_modified=None):
+        self.entries.set(key, CacheEntry(value, etag, last_modified, self.expires(collection)))
+
+    def refresh(self, key, entry, collection):
+        entry.expires = self.expires(collection)
+        self.entries.set(key, entry)
+
+    def invalidate(self, prefix):
+        for key in self.entries.keys():
+            if key.startswith(prefix):
+                self.entries.pop(key)
+
+
+
+disk_schema = '''
+create table if not exists entries (
+    key text primary key,
+    value text not null,
+    etag text,
+    last_modified text,
+    expires real not null,
+    size integer not null
+);
+create index if not exists entries_expires on entries (expires);
+'''
+
+
+class DiskCache(ResponseCache):
+
+    # A ResponseCache in a SQLite file, so processes on one host share it
+    # and it outlives restarts. Once the stored bodies take up more than
+    # max_bytes, the entries closest to expiring are dropped first.
+    # Entries hold the response body as JSON.
+    stores_body = True
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, ttl=60, ttls=None, clock=time.time, timeout=30):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.clock = clock
+        self.timeout = timeout
+        self.local = threading.local()
+        self.create_schema()
+
+    def create_schema(self):
+        # Processes starting together would otherwise race to create it.
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            db.execute('pragma journal_mode=wal')
+            db.execute('begin immediate')
+            for statement in disk_schema.split(';'):
+                if statement.strip():
+                    db.execute(statement)
+            db.execute('commit')
+        finally:
+            db.close()
+
+    def connection(self):
+        # sqlite3 connections can't be shared between threads.
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = self.local.db = sqlite3.connect(self.path, timeout=self.timeout)
+        return db
+
+    def get(self, key):
+        row = self.connection().execute(
+            'select value, etag, last_modified, expires from entries where key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(*row)
+
+    def set(self, key, value, collection, etag=None, last_modified=None):
+        db = self.connection()
+        with db:
+            db.execute('insert or replace into entries values (?, ?, ?, ?, ?, ?)',
+                       (key, value, etag, last_modified, self.expires(collection), len(value)))
+            self.evict(db)
+
+    def evict(self, db):
+        total = db.execute('select coalesce(sum(size), 0) from entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute('select key, size from entries order by expires').fetchall():
+            db.execute('delete from entries where key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def refresh(self, key, entry, collection):
+        entry.expires = self.expires(collection)
+        db = self.connection()
+        with db:
+            db.execute('update entries set expires = ? where key = ?', (entry.expires, key))
+
+    def invalidate(self, prefix):
+        db = self.connection()
+        with db:
+            db.execute("delete from entries where substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def close(self):
+        db = getattr(self.local, 'db', None)
+        if db is not None:
+            db.close()
+            self.local.db = None
+
+
+def request_key(path, data):
+    return path + '?' + json.dumps(data, sort_keys=True)
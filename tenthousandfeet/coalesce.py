@@ -0,0 +1,56 @@
+import sys
+import threading
+from copy import deepcopy
+
+
+class Flight(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.value = None
+        self.error = None
+
+
+class SingleFlight(object):
+
+    # Concurrent calls with the same key share one call of fn. When others
+    # have joined, every caller gets its own copy of the result, since
+    # results are mutable and nobody should see another's changes.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is None:
+                flight = self.flights[key] = Flight()
+                leader = True
+            else:
+                flight.waiters += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error[0], flight.error[1], flight.error[2]
+            return deepcopy(flight.value)
+
+        try:
+            flight.value = fn()
+        except BaseException:
+            flight.error = sys.exc_info()
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        # No one can join once the flight is removed, so the count is final.
+        if flight.waiters:
+            return deepcopy(flight.value)
+        return flight.value
+
+    def __len__(self):
+        return len(self.flights)
@@ -0,0 +1,48 @@
+import json
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
+
+class Codec(object):
+
+    # Decodes JSON straight from the bytes of a response, without building
+    # a unicode copy of the body first.
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def decode(self, res):
+        return self.loads(res.content)
+
+    def __repr__(self):
+        return 'Codec(%r)' % self.name
+
+
+codecs = {'json': Codec('json', json.loads, json.dumps)}
+if simplejson is not None:
+    codecs['simplejson'] = Codec('simplejson', simplejson.loads, simplejson.dumps)
+if ujson is not None:
+    codecs['ujson'] = Codec('ujson', ujson.loads, ujson.dumps)
+
+preferred = ('ujson', 'simplejson', 'json')
+
+
+def get_codec(codec=None):
+    # The fastest installed codec by default, a codec by name, or a Codec.
+    if isinstance(codec, Codec):
+        return codec
+    if codec is None:
+        return next(codecs[name] for name in preferred if name in codecs)
+    if codec not in codecs:
+        raise ValueError("JSON codec %r is not installed (available: %s)" % (codec, ', '.join(sorted(codecs))))
+    return codecs[codec]
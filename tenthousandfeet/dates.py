@@ -0,0 +1,55 @@
+import re
+from datetime import datetime
+from dateutil.parser import parse as date_parse
+from dateutil.tz import tzutc, tzoffset
+
+
+iso_pattern = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)'
+    r'(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6})\d*)?)?'
+    r'(Z|[+-]\d\d(?::?\d\d)?)?)?$'
+)
+
+utc = tzutc()
+memo = {}
+memo_size = 10000
+
+
+def parse_date(value):
+    # The API only sends a couple of fixed ISO 8601 formats and many rows
+    # share the same dates, so those are decoded by hand and remembered.
+    # Anything else goes to dateutil.
+    try:
+        return memo[value]
+    except (KeyError, TypeError):
+        pass
+    match = iso_pattern.match(value) if isinstance(value, basestring) else None
+    if match is None:
+        return date_parse(value)
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    try:
+        result = datetime(
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            int(fraction.ljust(6, '0')) if fraction else 0,
+            parse_tz(tz)
+        )
+    except ValueError:
+        return date_parse(value)
+    if len(memo) >= memo_size:
+        memo.clear()
+    memo[value] = result
+    return result
+
+
+def parse_tz(value):
+    if value is None:
+        return None
+    if value == 'Z':
+        return utc
+    sign = -1 if value[0] == '-' else 1
+    digits = value[1:].replace(':', '')
+    offset = sign * (int(digits[:2]) * 3600 + int(digits[2:] or 0) * 60)
+    if offset == 0:
+        return utc
+    return tzoffset(None, offset)
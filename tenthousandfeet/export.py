@@ -0,0 +1,174 @@
+import csv
+import json
+import os
+import sys
+import threading
+import Queue
+from . import CollectionClient, Record, TenThousandFeet, PROD_URL
+
+
+done = object()
+
+
+class Failure(object):
+
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+
+
+def iter_clients(client, names):
+    # Leaf collection clients for a dotted path such as users.time_entries,
+    # found by listing each parent collection.
+    if not names:
+        yield client
+        return
+    factory = getattr(client, names[0])
+    for item in client.iter_list():
+        for leaf in iter_clients(factory(item['id']), names[1:]):
+            yield leaf
+
+
+def iter_collection(client, path, kwargs=None, concurrency=8, buffer_size=1000):
+    names = path.split('.')
+    root = getattr(client, names[0])
+    if len(names) == 1:
+        return root.stream_list(**(kwargs or {}))
+    return fan_out(iter_clients(root, names[1:]), kwargs or {}, concurrency, buffer_size)
+
+
+def fan_out(clients, kwargs, concurrency, buffer_size):
+    # Workers stream items from different clients into one bounded queue,
+    # so memory stays flat no matter how many parents there are.
+    items = Queue.Queue(buffer_size)
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def put(value):
+        while not stopped.is_set():
+            try:
+                items.put(value, timeout=0.1)
+                return
+            except Queue.Full:
+                pass
+
+    def work():
+        try:
+            while not stopped.is_set():
+                with lock:
+                    try:
+                        client = next(clients)
+                    except StopIteration:
+                        break
+                for item in client.stream_list(**kwargs):
+                    put(item)
+                    if stopped.is_set():
+                        break
+        except BaseException:
+            put(Failure(sys.exc_info()))
+        put(done)
+
+    workers = [threading.Thread(target=work) for i in range(concurrency)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+
+    try:
+        finished = 0
+        while finished < len(workers):
+            item = items.get()
+            if item is done:
+                finished += 1
+            elif isinstance(item, Failure):
+                raise item.exc_info[0], item.exc_info[1], item.exc_info[2]
+            else:
+                yield item
+    finally:
+        stopped.set()
+
+
+class Writer(object):
+
+    def __init__(self, out):
+        self.out = out
+
+    def encode(self, value):
+        if isinstance(value, Record):
+            return value.to_dict()
+        encoded = CollectionClient.serialize_arg(value)
+        if encoded is value:
+            raise TypeError('%r is not JSON serializable' % value)
+        return encoded
+
+    def dumps(self, value):
+        return json.dumps(value, default=self.encode, sort_keys=True)
+
+
+class NDJSONWriter(Writer):
+
+    def write(self, item):
+        self.out.write(self.dumps(item) + '\n')
+
+
+class CSVWriter(Writer):
+
+    def __init__(self, out, fields=None):
+        super(CSVWriter, self).__init__(out)
+        self.fields = fields
+        self.writer = None
+
+    def write(self, item):
+        if self.writer is None:
+            self.fields = self.fields or sorted(item.keys())
+            self.writer = csv.writer(self.out)
+            self.writer.writerow(self.fields)
+        self.writer.writerow([self.cell(item.get(k)) for k in self.fields])
+
+    def cell(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list, Record)):
+            return self.dumps(value)
+        value = CollectionClient.serialize_arg(value)
+        if isinstance(value, unicode):
+            return value.encode('utf-8')
+        return value
+
+
+def export(client, path, out, format='ndjson', kwargs=None, fields=None, concurrency=8):
+    writer = CSVWriter(out, fields) if format == 'csv' else NDJSONWriter(out)
+    count = 0
+    for item in iter_collection(client, path, kwargs, concurrency):
+        writer.write(item)
+        count += 1
+    return count
+
+
+def configure(parser):
+    parser.add_argument('collection', help='collection to export, e.g. projects or users.time_entries')
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--output', '-o', help='file to write to (default: stdout)')
+    parser.add_argument('--token', default=os.environ.get('TENTHOUSANDFEET_TOKEN'),
+                        help='API token (default: $TENTHOUSANDFEET_TOKEN)')
+    parser.add_argument('--endpoint', default=PROD_URL)
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='parents to fetch at once for nested collections')
+    parser.add_argument('--fields', help='comma separated CSV columns (default: keys of the first row)')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                        help='list argument, e.g. --param from=2014-01-01')
+    parser.set_defaults(run=run)
+
+
+def run(args):
+    if not args.token:
+        sys.stderr.write('An API token is required (--token or $TENTHOUSANDFEET_TOKEN)\n')
+        return 2
+    client = TenThousandFeet(args.token, endpoint=args.endpoint)
+    kwargs = dict(param.split('=', 1) for param in args.param)
+    fields = args.fields.split(',') if args.fields else None
+    out = open(args.output, 'wb') if args.output else sys.stdout
+    try:
+        export(client, args.collection, out, args.format, kwargs, fields, args.concurrency)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
@@ -0,0 +1,206 @@
+import json
+import threading
+from datetime import datetime
+from urllib import urlencode
+from urlparse import urlparse, parse_qsl
+from . import collections
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code, body, reason=''):
+        self.status_code = status_code
+        self.reason = reason
+        self.text = json.dumps(body)
+        self.content = self.text
+        self.headers = {'Content-Type': 'application/json', 'Content-Length': str(len(self.text))}
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for i in xrange(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class NotFound(Exception):
+    pass
+
+
+class FakeAPI(object):
+
+    # An in-memory stand-in for the 10000ft API that can be used as the
+    # session of an HTTPClient, so calls never touch the network. Resources
+    # and the arguments they accept come from the `collections` spec.
+
+    default_per_page = 20
+    max_per_page = 1000
+    ignored_args = frozenset(['page', 'per_page', 'from', 'to', 'fields'])
+
+    def __init__(self, collections=collections):
+        self.collections = collections
+        self.headers = {}
+        self.items = {}
+        self.last_id = 0
+        self.lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        pass
+
+    def get(self, url, data=None, **kwargs):
+        return self.handle('GET', url, data)
+
+    def post(self, url, data=None, **kwargs):
+        return self.handle('POST', url, data)
+
+    def put(self, url, data=None, **kwargs):
+        return self.handle('PUT', url, data)
+
+    def delete(self, url, data=None, **kwargs):
+        return self.handle('DELETE', url, data)
+
+    def add(self, path, **fields):
+        # Stores an item directly, bypassing argument checks, and returns it.
+        with self.lock:
+            return self.insert(path.strip('/'), fields)
+
+    def load(self, path, rows):
+        return [self.add(path, **row) for row in rows]
+
+    def all(self, path):
+        with self.lock:
+            return list(self.items.get(path.strip('/'), {}).values())
+
+    def handle(self, verb, url, data):
+        url = urlparse(url)
+        try:
+            parts = self.route(url.path)
+        except NotFound:
+            return FakeResponse(404, {'message': 'Not found'}, 'Not Found')
+        args = dict(parse_qsl(url.query))
+        args.update(data or {})
+        is_item = len(parts) % 2 == 0
+        path = '/'.join(parts[:-1] if is_item else parts)
+        object_id = parts[-1] if is_item else None
+        method = {
+            ('GET', False): 'list',
+            ('GET', True): 'show',
+            ('POST', False): 'create',
+            ('PUT', True): 'update',
+            ('DELETE', True): 'delete'
+        }.get((verb, is_item))
+        desc = self.find(parts).get('methods', {}).get(method)
+        if desc is None:
+            return FakeResponse(405, {'message': 'Method not allowed'}, 'Method Not Allowed')
+        missing = [k for k in desc.get('required', []) if k not in args]
+        if missing:
+            return FakeResponse(422, {'message': '%s is required' % ', '.join(missing)}, 'Unprocessable Entity')
+        with self.lock:
+            try:
+                return getattr(self, 'do_' + method)(path, object_id, args)
+            except NotFound:
+                return FakeResponse(404, {'message': 'Not found'}, 'Not Found')
+
+    def route(self, url_path):
+        # The endpoint's own path (e.g. /api/v1/) comes before the first
+        # top level collection name.
+        parts = [p for p in url_path.split('/') if p]
+        for i, part in enumerate(parts):
+            if part in self.collections:
+                parts = parts[i:]
+                self.find(parts)
+                return parts
+        raise NotFound()
+
+    def find(self, parts):
+        desc = {'collections': self.collections}
+        for name in parts[::2]:
+            desc = desc.get('collections', {}).get(name)
+            if desc is None:
+                raise NotFound()
+        return desc
+
+    def insert(self, path, fields):
+        item = dict(fields)
+        if item.get('id') is None:
+            self.last_id += 1
+            item['id'] = self.last_id
+        else:
+            self.last_id = max(self.last_id, int(item['id']))
+        parts = path.split('/')
+        if len(parts) > 1:
+            # e.g. users/5/time_entries items belong to user_id 5.
+            item.setdefault(parts[-3][:-1] + '_id', int(parts[-2]) if parts[-2].isdigit() else parts[-2])
+        self.items.setdefault(path, {})[str(item['id'])] = item
+        return item
+
+    def lookup(self, path, object_id):
+        try:
+            return self.items[path][str(object_id)]
+        except KeyError:
+            raise NotFound()
+
+    def do_list(self, path, object_id, args):
+        rows = [item for item in self.items.get(path, {}).values() if self.matches(item, args)]
+        rows.sort(key=lambda item: item['id'])
+        page = int(args.get('page') or 1)
+        per_page = min(int(args.get('per_page') or self.default_per_page), self.max_per_page)
+        start = (page - 1) * per_page
+        next_url = None
+        if start + per_page < len(rows):
+            query = dict((k, v) for k, v in args.items() if k not in ('page', 'per_page'))
+            query.update(page=page + 1, per_page=per_page)
+            next_url = '/api/v1/%s?%s' % (path, urlencode(sorted(query.items())))
+        return FakeResponse(200, {
+            'data': rows[start:start + per_page],
+            'paging': {'page': page, 'per_page': per_page, 'next': next_url}
+        })
+
+    def matches(self, item, args):
+        start, end = args.get('from'), args.get('to')
+        if start or end:
+            if 'date' in item:
+                first = last = item['date']
+            else:
+                first, last = item.get('starts_at'), item.get('ends_at')
+            if start and last and last[:10] < start[:10]:
+                return False
+            if end and first and first[:10] > end[:10]:
+                return False
+        if item.get('archived') and not is_true(args.get('with_archived')):
+            return False
+        for k, v in args.items():
+            if k not in self.ignored_args and k in item and str(item[k]) != str(v):
+                return False
+        return True
+
+    def do_show(self, path, object_id, args):
+        return FakeResponse(200, {'data': self.lookup(path, object_id)})
+
+    def do_create(self, path, object_id, args):
+        now = timestamp()
+        return FakeResponse(200, {'data': self.insert(path, dict(args, created_at=now, updated_at=now))})
+
+    def do_update(self, path, object_id, args):
+        item = self.lookup(path, object_id)
+        item.update(args, id=item['id'], updated_at=timestamp())
+        return FakeResponse(200, {'data': item})
+
+    def do_delete(self, path, object_id, args):
+        self.lookup(path, object_id)
+        del self.items[path][str(object_id)]
+        return FakeResponse(200, {'data': {}})
+
+
+def is_true(value):
+    return value not in (None, False, '', 'false', '0', 0)
+
+
+def timestamp():
+    return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -0,0 +1,165 @@
+import threading
+from bisect import bisect_left
+from urllib import urlencode
+
+
+default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram(object):
+
+    def __init__(self, buckets=default_buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return {'buckets': cumulative, 'count': self.count, 'sum': self.sum}
+
+
+class Metrics(object):
+
+    # Collects per-collection call latency, status codes, retries, bytes
+    # transferred and time spent decoding and processing responses.
+
+    def __init__(self, buckets=default_buckets):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.errors = {}
+        self.requests = {}
+        self.statuses = {}
+        self.retries = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.decode_seconds = {}
+        self.process_seconds = {}
+        self.items = {}
+
+    def install(self, http):
+        http.add_hook('after_response', self.after_response)
+        http.add_hook('retry', self.retry)
+        http.add_hook('after_call', self.after_call)
+        http.add_hook('processed', self.processed)
+        return self
+
+    def histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram(self.buckets)
+        return histogram
+
+    def after_response(self, method, url, data, response, elapsed, stream):
+        sent = len(urlencode(data, True)) if data else 0
+        headers = getattr(response, 'headers', None) or {}
+        received = int(headers.get('Content-Length') or 0)
+        if not received and not stream:
+            received = len(getattr(response, 'content', '') or '')
+        with self.lock:
+            self.histogram(self.requests, method).observe(elapsed)
+            key = (method, response.status_code)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+
+    def retry(self, method, url, attempt, delay, status_code):
+        with self.lock:
+            key = (method, status_code)
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def after_call(self, collection, method, elapsed, error):
+        key = (collection, method)
+        with self.lock:
+            self.histogram(self.calls, key).observe(elapsed)
+            if error is not None:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def processed(self, collection, method, decode_time, process_time, count):
+        key = (collection, method)
+        with self.lock:
+            self.decode_seconds[key] = self.decode_seconds.get(key, 0) + decode_time
+            self.process_seconds[key] = self.process_seconds.get(key, 0) + process_time
+            self.items[key] = self.items.get(key, 0) + count
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'calls': dict(('%s.%s' % key, h.as_dict()) for key, h in self.calls.items()),
+                'errors': dict(('%s.%s' % key, n) for key, n in self.errors.items()),
+                'requests': dict((key, h.as_dict()) for key, h in self.requests.items()),
+                'statuses': dict(('%s %s' % key, n) for key, n in self.statuses.items()),
+                'retries': dict(('%s %s' % key, n) for key, n in self.retries.items()),
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'decode_seconds': dict(('%s.%s' % key, n) for key, n in self.decode_seconds.items()),
+                'process_seconds': dict(('%s.%s' % key, n) for key, n in self.process_seconds.items()),
+                'items': dict(('%s.%s' % key, n) for key, n in self.items.items())
+            }
+
+    def to_prometheus(self, prefix='tenthousandfeet'):
+        lines = []
+
+        def metric(name, kind, help):
+            lines.append('# HELP %s_%s %s' % (prefix, name, help))
+            lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+
+        def sample(name, labels, value):
+            label_text = ','.join('%s="%s"' % (k, escape(v)) for k, v in labels)
+            lines.append('%s_%s{%s} %s' % (prefix, name, label_text, format_value(value)))
+
+        def histograms(name, table, label_names):
+            for key, h in sorted(table.items()):
+                labels = zip(label_names, key if isinstance(key, tuple) else (key,))
+                for bound, count in h.as_dict()['buckets']:
+                    sample(name + '_bucket', labels + [('le', format_value(bound))], count)
+                sample(name + '_bucket', labels + [('le', '+Inf')], h.count)
+                sample(name + '_sum', labels, h.sum)
+                sample(name + '_count', labels, h.count)
+
+        def counters(name, table, label_names):
+            for key, value in sorted(table.items()):
+                sample(name, zip(label_names, key), value)
+
+        with self.lock:
+            metric('call_duration_seconds', 'histogram', 'Collection method latency including processing.')
+            histograms('call_duration_seconds', self.calls, ('collection', 'method'))
+            metric('call_errors_total', 'counter', 'Collection method calls that raised.')
+            counters('call_errors_total', self.errors, ('collection', 'method'))
+            metric('request_duration_seconds', 'histogram', 'HTTP round trip time.')
+            histograms('request_duration_seconds', self.requests, ('method',))
+            metric('responses_total', 'counter', 'HTTP responses by status code.')
+            counters('responses_total', self.statuses, ('method', 'status'))
+            metric('retries_total', 'counter', 'Requests retried by the scheduler.')
+            counters('retries_total', self.retries, ('method', 'status'))
+            metric('sent_bytes_total', 'counter', 'Request body bytes sent.')
+            lines.append('%s_sent_bytes_total %d' % (prefix, self.bytes_sent))
+            metric('received_bytes_total', 'counter', 'Response body bytes received.')
+            lines.append('%s_received_bytes_total %d' % (prefix, self.bytes_received))
+            metric('decode_seconds_total', 'counter', 'Time spent decoding JSON responses.')
+            counters('decode_seconds_total', self.decode_seconds, ('collection', 'method'))
+            metric('process_seconds_total', 'counter', 'Time spent applying process rules such as date parsing.')
+            counters('process_seconds_total', self.process_seconds, ('collection', 'method'))
+            metric('items_total', 'counter', 'Items returned.')
+            counters('items_total', self.items, ('collection', 'method'))
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
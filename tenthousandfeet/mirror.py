@@ -0,0 +1,186 @@
+import json
+import sqlite3
+from datetime import date, datetime, timedelta
+from . import MethodSpec, Record, collections, imap_concurrently
+
+
+schema = '''
+create table if not exists records (
+    collection text not null,
+    id text not null,
+    parent_id text,
+    date text,
+    updated_at text,
+    deleted_at text,
+    data text not null,
+    primary key (collection, id)
+);
+create index if not exists records_parent on records (collection, parent_id, date);
+create table if not exists checkpoints (
+    collection text primary key,
+    synced_at text not null
+);
+'''
+
+specs = {
+    'projects': MethodSpec(collections['projects']['methods']['list']),
+    'users': MethodSpec(collections['users']['methods']['list']),
+    'time_entries': MethodSpec(collections['users']['collections']['time_entries']['methods']['list'])
+}
+
+
+class Mirror(object):
+
+    # Keeps a local SQLite copy of projects, users and their time entries.
+    # Projects and users are listed in full, but only rows whose updated_at
+    # or deleted_at changed are written. Time entries are only fetched from
+    # `lookback` before the previous sync onwards.
+
+    def __init__(self, client, path, lookback=timedelta(days=30), concurrency=8):
+        self.client = client
+        self.lookback = lookback
+        self.concurrency = concurrency
+        self.db = sqlite3.connect(path)
+        self.db.executescript(schema)
+
+    def close(self):
+        self.db.close()
+
+    def sync(self):
+        return {
+            'projects': self.sync_projects(),
+            'users': self.sync_users(),
+            'time_entries': self.sync_time_entries()
+        }
+
+    def sync_projects(self):
+        return self.sync_collection('projects', self.client.projects.iter_list(with_archived=True))
+
+    def sync_users(self):
+        return self.sync_collection('users', self.client.users.iter_list())
+
+    def sync_collection(self, name, items):
+        known = dict(
+            (row[0], row[1:]) for row in
+            self.db.execute('select id, updated_at, deleted_at, data from records where collection = ?', (name,))
+        )
+        changed = 0
+        with self.db:
+            for item in items:
+                item = to_dict(item)
+                object_id = unicode(item['id'])
+                versions = (serialize(item.get('updated_at')), serialize(item.get('deleted_at')))
+                if changed_since(known.pop(object_id, None), versions, item):
+                    self.store(name, object_id, None, None, versions, item)
+                    changed += 1
+            # Anything no longer listed has been removed upstream.
+            for object_id in known:
+                self.db.execute('delete from records where collection = ? and id = ?', (name, object_id))
+                changed += 1
+            self.checkpoint(name)
+        return changed
+
+    def sync_time_entries(self):
+        started = date.today()
+        since = self.last_synced('time_entries')
+        start = since - self.lookback if since else None
+        user_ids = [row[0] for row in self.db.execute(
+            'select id from records where collection = ? and deleted_at is null', ('users',))]
+
+        def fetch(user_id):
+            kwargs = {'from': start} if start else {}
+            return user_id, list(self.client.users.time_entries(user_id).iter_list(**kwargs))
+
+        changed = 0
+        for user_id, entries in imap_concurrently(fetch, user_ids, self.concurrency, ordered=False):
+            with self.db:
+                changed += self.store_time_entries(user_id, start, entries)
+        with self.db:
+            self.checkpoint('time_entries', started)
+        return changed
+
+    def store_time_entries(self, user_id, start, entries):
+        query = 'select id, updated_at, deleted_at, data from records where collection = ? and parent_id = ?'
+        args = ['time_entries', user_id]
+        if start:
+            query += ' and date >= ?'
+            args.append(serialize(start))
+        known = dict((row[0], row[1:]) for row in self.db.execute(query, args))
+        changed = 0
+        for item in entries:
+            item = to_dict(item)
+            object_id = unicode(item['id'])
+            versions = (serialize(item.get('updated_at')), serialize(item.get('deleted_at')))
+            if changed_since(known.pop(object_id, None), versions, item):
+                self.store('time_entries', object_id, user_id, serialize(item.get('date')), versions, item)
+                changed += 1
+        for object_id in known:
+            self.db.execute('delete from records where collection = ? and id = ?', ('time_entries', object_id))
+            changed += 1
+        return changed
+
+    def store(self, name, object_id, parent_id, day, versions, item):
+        self.db.execute(
+            'insert or replace into records values (?, ?, ?, ?, ?, ?, ?)',
+            (name, object_id, parent_id, day[:10] if day else None, versions[0], versions[1],
+             dump(item))
+        )
+
+    def checkpoint(self, name, synced_at=None):
+        self.db.execute('insert or replace into checkpoints values (?, ?)',
+                        (name, serialize(synced_at or date.today())))
+
+    def last_synced(self, name):
+        row = self.db.execute('select synced_at from checkpoints where collection = ?', (name,)).fetchone()
+        return datetime.strptime(row[0], '%Y-%m-%d').date() if row else None
+
+    def get(self, name, object_id):
+        row = self.db.execute('select data from records where collection = ? and id = ?',
+                              (name, unicode(object_id))).fetchone()
+        return specs[name].process(json.loads(row[0])) if row else None
+
+    def rows(self, name, parent_id=None, start=None, end=None):
+        query = 'select data from records where collection = ?'
+        args = [name]
+        if parent_id is not None:
+            query += ' and parent_id = ?'
+            args.append(unicode(parent_id))
+        if start is not None:
+            query += ' and date >= ?'
+            args.append(serialize(start))
+        if end is not None:
+            query += ' and date <= ?'
+            args.append(serialize(end))
+        spec = specs[name]
+        for row in self.db.execute(query + ' order by date, id', args):
+            yield spec.process(json.loads(row[0]))
+
+
+def to_dict(item):
+    return item.to_dict() if isinstance(item, Record) else item
+
+
+def serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    elif isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    elif isinstance(value, Record):
+        return value.to_dict()
+    elif value is None:
+        return None
+    elif isinstance(value, basestring):
+        return value
+    raise TypeError('%r is not JSON serializable' % value)
+
+
+def changed_since(stored, versions, item):
+    # Rows without an updated_at are compared by content instead.
+    if stored is None or stored[:2] != versions:
+        return True
+    return not versions[0] and stored[2] != dump(item)
+
+
+def dump(item):
+    # Sorted keys so that unchanged rows always dump to the same text.
+    return json.dumps(item, default=serialize, sort_keys=True)
@@ -0,0 +1,146 @@
+import re
+
+
+identifier_pattern = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class Record(object):
+
+    # Fields are stored in slots holding the raw JSON values. Fields with
+    # process rules are decoded the first time they're read.
+
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def get(self, key, default=None):
+        if key not in self._fields:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return list(self._fields)
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self._fields]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.to_dict())
+
+
+class LazyField(object):
+
+    def __init__(self, raw, decoded, decode):
+        self.raw = raw
+        self.decoded = decoded
+        self.decode = decode
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        try:
+            return self.decoded.__get__(obj, cls)
+        except AttributeError:
+            value = self.raw.__get__(obj, cls)
+            if value is not None:
+                value = self.decode(value)
+            self.decoded.__set__(obj, value)
+            return value
+
+    def __set__(self, obj, value):
+        self.decoded.__set__(obj, value)
+
+
+class RecordFactory(object):
+
+    def __init__(self, decoders):
+        self.decoders = decoders
+        self.classes = {}
+
+    def __call__(self, data):
+        if not isinstance(data, dict):
+            return data
+        keys = tuple(data)
+        try:
+            cls, setters = self.classes[keys]
+        except KeyError:
+            if not all(is_field_name(k) for k in keys):
+                return data
+            cls, setters = self.classes[keys] = self.create_class(keys)
+        record = cls.__new__(cls)
+        for set_slot, k in setters:
+            set_slot(record, data[k])
+        return record
+
+    def extend(self, record, fields):
+        # A record with extra fields. Fields not read yet stay undecoded.
+        data = {}
+        decoded = []
+        for k in record._fields:
+            if k in self.decoders:
+                data[k] = getattr(record, '_raw_' + k)
+                try:
+                    decoded.append(('_decoded_' + k, getattr(record, '_decoded_' + k)))
+                except AttributeError:
+                    pass
+            else:
+                data[k] = getattr(record, k)
+        data.update(fields)
+        extended = self(data)
+        for slot, value in decoded:
+            setattr(extended, slot, value)
+        return extended
+
+    def create_class(self, keys):
+        slots = []
+        for k in keys:
+            if k in self.decoders:
+                slots.extend(['_raw_' + k, '_decoded_' + k])
+            else:
+                slots.append(k)
+        cls = type('Record', (Record,), {'__slots__': tuple(slots), '_fields': keys})
+        setters = []
+        for k in keys:
+            if k in self.decoders:
+                raw = getattr(cls, '_raw_' + k)
+                setattr(cls, k, LazyField(raw, getattr(cls, '_decoded_' + k), self.decoders[k]))
+            else:
+                raw = getattr(cls, k)
+            setters.append((raw.__set__, k))
+        return cls, tuple(setters)
+
+
+reserved_names = frozenset(dir(Record))
+
+
+def is_field_name(name):
+    return identifier_pattern.match(name) is not None and name not in reserved_names
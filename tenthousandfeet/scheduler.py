@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from email.utils import parsedate_tz, mktime_tz
+import requests
+
+
+class TokenBucket(object):
+
+    def __init__(self, rate, capacity=None, clock=time.time, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class AdaptiveLimit(object):
+
+    # The limit is halved whenever the server throttles us and grows back by
+    # roughly one slot per window of successful requests.
+
+    def __init__(self, initial, minimum=1, maximum=None):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.active = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= max(self.minimum, int(self.limit)):
+                self.condition.wait()
+            self.active += 1
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def throttled(self):
+        with self.condition:
+            self.limit = max(float(self.minimum), self.limit / 2)
+
+    def succeeded(self):
+        with self.condition:
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+
+
+class Scheduler(object):
+
+    retry_statuses = (429, 500, 502, 503, 504)
+    throttle_statuses = (429, 503)
+
+    def __init__(self, rate=None, burst=None, concurrency=10, max_concurrency=None,
+                 retries=5, backoff=0.5, max_backoff=60, sleep=time.sleep):
+        self.bucket = TokenBucket(rate, burst, sleep=sleep) if rate else None
+        self.limit = AdaptiveLimit(concurrency, maximum=max_concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+
+    def call(self, send, idempotent=True, on_retry=None):
+        attempt = 0
+        while True:
+            if self.bucket:
+                self.bucket.acquire()
+            self.limit.acquire()
+            try:
+                res = send()
+            except requests.ConnectionError:
+                if not idempotent or attempt >= self.retries:
+                    raise
+                res = None
+            finally:
+                self.limit.release()
+
+            if res is not None:
+                if res.status_code in self.throttle_statuses:
+                    self.limit.throttled()
+                elif res.status_code < 500:
+                    self.limit.succeeded()
+                if not self.should_retry(res, idempotent) or attempt >= self.retries:
+                    return res
+
+            delay = self.delay(attempt, res)
+            if res is not None:
+                # Hands a streamed response's connection back to the pool.
+                res.close()
+            if on_retry is not None:
+                on_retry(attempt=attempt + 1, delay=delay,
+                         status_code=res.status_code if res is not None else None)
+            self.sleep(delay)
+            attempt += 1
+
+    def should_retry(self, res, idempotent):
+        # A 429 means the request was refused, so even a POST is safe to resend.
+        if res.status_code == 429:
+            return True
+        return idempotent and res.status_code in self.retry_statuses
+
+    def delay(self, attempt, res=None):
+        if res is not None:
+            retry_after = parse_retry_after(res.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(self.max_backoff, retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0, float(value))
+    except ValueError:
+        parsed = parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(0, mktime_tz(parsed) - time.time())
@@ -0,0 +1,89 @@
+import codecs
+import json
+
+
+decoder = json.JSONDecoder()
+whitespace = ' \t\n\r'
+delimiters = whitespace + ',:]}'
+
+
+class JSONStream(object):
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decode = codecs.getincrementaldecoder('utf-8')().decode
+        self.buffer = u''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        try:
+            text = self.decode(next(self.chunks))
+        except StopIteration:
+            text = self.decode('', True)
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in whitespace:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError('Unexpected end of JSON stream')
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError('Expected %r at %r in JSON stream' % (chars, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+            else:
+                # A number cut off by the end of a chunk still decodes, so a
+                # value only counts once it's followed by a delimiter.
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in delimiters):
+                    self.pos = end
+                    return value
+            if not self.fill():
+                raise ValueError('Unexpected end of JSON stream')
+
+
+def iter_items(chunks, key='data', rest=None):
+    # Yields the items of the array at `key` in a JSON object as they are
+    # read from `chunks`. Other members of the object are stored in `rest`.
+    stream = JSONStream(chunks)
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        name = stream.value()
+        stream.expect(':')
+        if name == key and stream.peek() == '[':
+            stream.expect('[')
+            if stream.peek() == ']':
+                stream.expect(']')
+            else:
+                while True:
+                    yield stream.value()
+                    if stream.expect(',]') == ']':
+                        break
+        else:
+            value = stream.value()
+            if rest is not None:
+                rest[name] = value
+        if stream.expect(',}') == '}':
+            return
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+import Queue
+from collections import deque
+from . import BulkResult
+
+
+class WriteBehind(object):
+
+    # Accepts time entry creates and updates, appends them to a spool file
+    # and returns straight away. Workers send them in the background, in
+    # order for each updated entry and each (user, date) of creates, and
+    # mark each one done in the spool, so pending writes are picked up again
+    # after a crash. A write that was sent but not yet marked done is sent
+    # again on resume.
+
+    def __init__(self, client, path, concurrency=4, batch_size=50, retries=5, fsync=True, on_done=None):
+        self.client = client
+        self.path = path
+        self.batch_size = batch_size
+        self.retries = retries
+        self.fsync = fsync
+        self.on_done = on_done
+        self.failures = []
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.lanes = {}
+        self.ready = Queue.Queue()
+        self.outstanding = 0
+        self.seq = 0
+
+        pending = self.recover()
+        self.spool = open(path, 'ab')
+        for op in pending:
+            self.schedule(op)
+        self.workers = [threading.Thread(target=self.work) for i in range(concurrency)]
+        for worker in self.workers:
+            worker.daemon = True
+            worker.start()
+
+    def create(self, user_id, **kwargs):
+        data = self.entries(user_id).validate_kwargs('create', kwargs)
+        return self.enqueue({'method': 'create', 'user_id': user_id, 'data': data})
+
+    def update(self, user_id, object_id, **kwargs):
+        data = self.entries(user_id).validate_kwargs('update', kwargs)
+        return self.enqueue({'method': 'update', 'user_id': user_id, 'id': object_id, 'data': data})
+
+    def entries(self, user_id):
+        return self.client.users.time_entries(user_id)
+
+    def enqueue(self, op):
+        with self.lock:
+            self.seq += 1
+            op['seq'] = self.seq
+            self.append([dict(op, op='write')])
+            self.schedule(op)
+        return op['seq']
+
+    def flush(self, timeout=None):
+        # Waits until every write so far has been sent or has failed.
+        deadline = time.time() + timeout if timeout is not None else None
+        with self.lock:
+            while self.outstanding:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                self.idle.wait(remaining)
+            return self.outstanding == 0
+
+    def close(self, timeout=None):
+        drained = self.flush(timeout)
+        for worker in self.workers:
+            self.ready.put(None)
+        for worker in self.workers:
+            worker.join()
+        with self.lock:
+            self.spool.close()
+            if drained:
+                self.compact([])
+
+    def recover(self):
+        # Replays the spool and rewrites it with only the pending writes.
+        pending = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A write torn by the crash was never acknowledged.
+                        continue
+                    self.seq = max(self.seq, record['seq'])
+                    if record['op'] == 'write':
+                        pending[record['seq']] = record
+                    else:
+                        pending.pop(record['seq'], None)
+        pending = [pending[seq] for seq in sorted(pending)]
+        self.compact(pending)
+        return pending
+
+    def compact(self, pending):
+        temp = self.path + '.tmp'
+        with open(temp, 'wb') as f:
+            for op in pending:
+                f.write(json.dumps(op) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(temp, self.path)
+
+    def append(self, records):
+        self.spool.write(''.join(json.dumps(r, sort_keys=True) + '\n' for r in records))
+        self.spool.flush()
+        if self.fsync:
+            os.fsync(self.spool.fileno())
+
+    def lane(self, op):
+        if op['method'] == 'update':
+            return (op['user_id'], 'id', op['id'])
+        return (op['user_id'], op['data'].get('date'))
+
+    def schedule(self, op):
+        # Called with the lock held. Each lane is worked on by at most one
+        # worker at a time, which keeps its writes in order.
+        key = self.lane(op)
+        self.outstanding += 1
+        lane = self.lanes.get(key)
+        if lane is None:
+            self.lanes[key] = deque([op])
+            self.ready.put(key)
+        else:
+            lane.append(op)
+
+    def work(self):
+        while True:
+            key = self.ready.get()
+            if key is None:
+                return
+            with self.lock:
+                lane = self.lanes[key]
+                batch = [lane.popleft() for i in range(min(self.batch_size, len(lane)))]
+
+            results = [(op, self.send(op)) for op in batch]
+
+            with self.lock:
+                try:
+                    # One spool write for the whole batch.
+                    self.append([{'op': 'done', 'seq': op['seq'], 'ok': r.error is None} for op, r in results])
+                except Exception, e:
+                    # The writes stay pending in the spool, so they are sent
+                    # again on resume.
+                    self.failures.extend((op, e) for op, r in results)
+                for op, r in results:
+                    if r.error is not None:
+                        self.failures.append((op, r.error))
+                if lane:
+                    self.ready.put(key)
+                else:
+                    del self.lanes[key]
+                self.outstanding -= len(batch)
+                if not self.outstanding:
+                    self.idle.notify_all()
+                    try:
+                        # Nothing is pending, so the spool can start over.
+                        self.spool.seek(0)
+                        self.spool.truncate()
+                    except Exception:
+                        # Every write is marked done, so the spool is still correct.
+                        pass
+
+            if self.on_done:
+                for op, r in results:
+                    try:
+                        self.on_done(op['seq'], r.result, r.error)
+                    except Exception, e:
+                        with self.lock:
+                            self.failures.append((op, e))
+
+    def send(self, op):
+        client = self.entries(op['user_id'])
+        if op['method'] == 'create':
+            job = (op, '', op['data'])
+            http_fn = client.http.post
+        else:
+            job = (op, op['id'], op['data'])
+            http_fn = client.http.put
+        try:
+            return client.send_with_retries(http_fn, op['method'], self.retries, job)
+        except Exception, e:
+            return BulkResult(op, None, e)
@@ -1,15 +1,22 @@
+import json
 from mock import Mock
 
 
 class MockHTTPResponse(object):
-    def __init__(self, status_code=200, text='', data=None):
+    def __init__(self, status_code=200, text='', data=None, reason=''):
         self.status_code = status_code
         self.text = text
+        self.reason = reason
         self._data = data if data else {}
+        self.content = json.dumps(self._data)
+        self.closed = False
         
     def json(self):
         return self._data
         
+    def close(self):
+        self.closed = True
+        
 
 def make_mock_response_obj(data=None):
     return Mock(return_value=MockHTTPResponse(data=data))
\ No newline at end of file
@@ -0,0 +1,68 @@
+import unittest
+from datetime import date, datetime
+from tenthousandfeet import TenThousandFeet, TEST_URL
+from tenthousandfeet.analytics import np, TimeEntries, Assignments
+
+
+entries = [
+    {'id': 1, 'user_id': 10, 'assignable_id': 100, 'date': datetime(2014, 7, 7), 'hours': 8},
+    {'id': 2, 'user_id': 10, 'assignable_id': 100, 'date': datetime(2014, 7, 8), 'hours': 4},
+    {'id': 3, 'user_id': 11, 'assignable_id': 200, 'date': '2014-07-08', 'hours': 2},
+    {'id': 4, 'user_id': 11, 'assignable_id': 100, 'date': '2014-07-14', 'hours': 6.5},
+]
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestAnalytics(unittest.TestCase):
+    
+    def setUp(self):
+        self.entries = TimeEntries(entries)
+        
+        
+    def test_hours_by_user(self):
+        users, hours = self.entries.hours_by_user()
+        self.assertEqual(users.tolist(), [10, 11])
+        self.assertEqual(hours.tolist(), [12, 8.5])
+        
+        
+    def test_hours_by_project_week(self):
+        projects, weeks, hours = self.entries.hours_by_project_week()
+        self.assertEqual(projects.tolist(), [100, 200])
+        self.assertEqual(weeks.tolist(), [date(2014, 7, 7), date(2014, 7, 14)])
+        self.assertEqual(hours.tolist(), [[12, 6.5], [2, 0]])
+        
+        
+    def test_select(self):
+        self.assertEqual(self.entries.select(user_id=11).tolist(), [2, 3])
+        self.assertEqual(self.entries.select(project_id=100, start=date(2014, 7, 8)).tolist(), [1, 3])
+        self.assertEqual(self.entries.select(user_id=99).tolist(), [])
+        
+        
+    def test_utilization(self):
+        users, utilization = self.entries.utilization(date(2014, 7, 7), date(2014, 7, 11))
+        self.assertEqual(utilization.tolist(), [12 / 40.0, 2 / 40.0])
+        
+        
+    def test_budget_burn(self):
+        budget_items = [
+            {'assignable_id': 100, 'item_type': 'TimeFees', 'amount': 20},
+            {'assignable_id': 100, 'item_type': 'Expenses', 'amount': 500}
+        ]
+        projects, hours, budget, burn = self.entries.budget_burn(budget_items, 'TimeFees')
+        self.assertEqual(budget.tolist(), [20, 0])
+        self.assertEqual(burn[0], 18.5 / 20)
+        self.assertTrue(np.isnan(burn[1]))
+        
+        
+    def test_assignments(self):
+        assignments = Assignments([
+            {'id': 1, 'user_id': 10, 'assignable_id': 100, 'starts_at': '2014-07-07', 'ends_at': '2014-07-18', 'percent': 0.5},
+            {'id': 2, 'user_id': 11, 'assignable_id': 100, 'starts_at': '2014-07-01', 'ends_at': '2014-07-10', 'fixed_hours': 16},
+        ])
+        users, hours = assignments.scheduled_hours_by_user(date(2014, 7, 7), date(2014, 7, 11))
+        self.assertEqual(hours.tolist(), [20, 16 * 4 / 8.0])
+        
+        
+    def test_user_assignments_collection(self):
+        client = TenThousandFeet('abc123', endpoint=TEST_URL)
+        self.assertIn('list', client.users.assignments(1).methods)
@@ -0,0 +1,83 @@
+import unittest
+import threading
+from mock import Mock
+from tenthousandfeet import AsyncHTTPClient, AsyncCollectionClient, AsyncTenThousandFeet, Error, TEST_URL
+from tenthousandfeet.fake import FakeAPI
+from . import MockHTTPResponse, make_mock_response_obj
+
+
+class TestAsync(unittest.TestCase):
+    
+    def setUp(self):
+        self.http = AsyncHTTPClient('abc123', 'http://endpoint', concurrency=4)
+        
+        
+    def tearDown(self):
+        self.http.close()
+        
+        
+    def test_returns_result(self):
+        client = AsyncCollectionClient(self.http, 'foo', {'show': {'optional': ['bar']} }, {})
+        client.http.get = make_mock_response_obj({'data': {'id': 1}})
+        result = client.show(1, bar=123)
+        self.assertEqual(result.get(), {'id': 1})
+        client.http.get.assert_called_with(path='foo/1', data={'bar': 123})
+        
+        
+    def test_arguments_checked_eagerly(self):
+        client = AsyncCollectionClient(self.http, 'foo', {'create': {'required': ['bar']} }, {})
+        
+        with self.assertRaises(AssertionError):
+            client.create()
+            
+            
+    def test_errors_raised_from_result(self):
+        client = AsyncCollectionClient(self.http, 'foo', {'show': {} }, {})
+        client.http.session.get = Mock(return_value=MockHTTPResponse(status_code=404, data={'message': 'nope'}))
+        result = client.show(1)
+        
+        with self.assertRaises(Error):
+            result.get()
+            
+            
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        release = threading.Event()
+        
+        def get(path, data):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            release.wait(1)
+            with lock:
+                state['active'] -= 1
+            return MockHTTPResponse(data={'data': {}})
+        
+        client = AsyncCollectionClient(self.http, 'foo', {'show': {} }, {})
+        client.http.get = get
+        results = [client.show(i) for i in range(10)]
+        results[0].wait(0.2)
+        release.set()
+        for result in results:
+            result.get()
+        
+        self.assertEqual(state['peak'], 4)
+        
+        
+    def test_sub_collections_are_async(self):
+        client = AsyncTenThousandFeet('abc123', endpoint=TEST_URL, concurrency=2)
+        self.assertIsInstance(client.users.time_entries(1), AsyncCollectionClient)
+        client.close()
+        
+        
+    def test_prefetching_list_is_async(self):
+        api = FakeAPI()
+        api.add('users', id=1, first_name='Ann')
+        api.add('users/1/statuses', status='busy')
+        client = AsyncTenThousandFeet('abc123', session=api, concurrency=2)
+        
+        result = client.users.list(prefetch=['statuses'])
+        
+        self.assertEqual(result.get()[0]['statuses'][0]['status'], 'busy')
+        client.close()
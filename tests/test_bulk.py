@@ -0,0 +1,92 @@
+import unittest
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, Error
+from . import MockHTTPResponse
+
+
+methods = {
+    'create': {'required': ['date', 'hours'], 'optional': ['project_id']},
+    'update': {'optional': ['hours']},
+    'delete': {}
+}
+
+
+class TestBulk(unittest.TestCase):
+    
+    def setUp(self):
+        self.http = HTTPClient('abc123', 'http://endpoint')
+        self.client = CollectionClient(self.http, 'foo', methods, {})
+        self.client.bulk_retry_delay = 0
+        
+        
+    def test_bulk_create(self):
+        self.client.http.session.post = Mock(side_effect=lambda url, data: 
+            MockHTTPResponse(data={'data': dict(data, id=data['hours'])}))
+        rows = [{'date': '2014-01-01', 'hours': i} for i in range(10)]
+        
+        report = self.client.bulk_create(rows)
+        
+        self.assertEqual([r.row for r in report], rows)
+        self.assertEqual([r.result['id'] for r in report], range(10))
+        self.assertTrue(all(r.error is None for r in report))
+        
+        
+    def test_rows_validated_up_front(self):
+        self.client.http.session.post = Mock()
+        
+        with self.assertRaises(AssertionError):
+            self.client.bulk_create([{'date': '2014-01-01', 'hours': 1}, {'date': '2014-01-01'}])
+        with self.assertRaises(AssertionError):
+            self.client.bulk_create([{'date': '2014-01-01', 'hours': 1, 'nope': 1}])
+            
+        self.assertFalse(self.client.http.session.post.called)
+        
+        
+    def test_concurrency_must_be_positive(self):
+        self.client.http.session.post = Mock()
+        
+        with self.assertRaises(AssertionError):
+            self.client.bulk_create([{'date': '2014-01-01', 'hours': 1}], concurrency=0)
+        
+        self.assertFalse(self.client.http.session.post.called)
+        
+        
+    def test_bulk_update_requires_ids(self):
+        self.client.http.session.put = Mock()
+        
+        with self.assertRaises(AssertionError) as cm:
+            self.client.bulk_update([{'id': 1, 'hours': 1}, {'hours': 2}])
+        
+        self.assertEqual(str(cm.exception), "row 1: id is required to update foo")
+        self.assertFalse(self.client.http.session.put.called)
+        
+        
+    def test_bulk_update_retries_transient_errors(self):
+        self.client.http.session.put = Mock(side_effect=[
+            MockHTTPResponse(status_code=503),
+            MockHTTPResponse(data={'data': {'id': 1, 'hours': 2}})
+        ])
+        
+        report = self.client.bulk_update([{'id': 1, 'hours': 2}])
+        
+        self.assertEqual(report[0].result, {'id': 1, 'hours': 2})
+        self.client.http.session.put.assert_called_with('http://endpointfoo/1', data={'hours': 2})
+        
+        
+    def test_create_not_retried_on_server_error(self):
+        self.client.http.session.post = Mock(return_value=MockHTTPResponse(status_code=500))
+        
+        report = self.client.bulk_create([{'date': '2014-01-01', 'hours': 1}])
+        
+        self.assertIsInstance(report[0].error, Error)
+        self.assertEqual(self.client.http.session.post.call_count, 1)
+        
+        
+    def test_bulk_delete_reports_errors(self):
+        self.client.http.session.delete = Mock(side_effect=lambda url, data: 
+            MockHTTPResponse(status_code=404) if url.endswith('/2') else MockHTTPResponse())
+        
+        report = self.client.bulk_delete([1, 2, 3], retries=0)
+        
+        self.assertEqual([r.row for r in report], [1, 2, 3])
+        self.assertEqual([r.error.status_code if r.error else None for r in report], [None, 404, None])
@@ -0,0 +1,171 @@
+import os
+import shutil
+import tempfile
+import unittest
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, ResponseCache, DiskCache
+from tenthousandfeet.cache import LRUCache
+from . import MockHTTPResponse
+
+
+def response(status_code=200, data=None, headers=None):
+    res = MockHTTPResponse(status_code=status_code, data=data)
+    res.headers = headers or {}
+    return res
+
+
+class TestCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.now = [0]
+        self.cache = ResponseCache(ttl=10, ttls={'bar': 100}, clock=lambda: self.now[0])
+        self.http = HTTPClient('abc123', 'http://endpoint', cache=self.cache)
+        self.client = CollectionClient(self.http, 'foo', {
+            'list': {'optional': ['page'], 'process': {'n': lambda v: v + 1}},
+            'show': {},
+            'update': {}
+        }, {})
+        
+        
+    def test_fresh_entries_are_reused(self):
+        self.http.session.get = Mock(return_value=response(data={'data': [{'n': 1}]}))
+        
+        first = self.client.list()
+        first[0]['n'] = 666
+        second = self.client.list()
+        
+        self.assertEqual(second, [{'n': 2}])
+        self.assertEqual(self.http.session.get.call_count, 1)
+        self.client.list(page=2)
+        self.assertEqual(self.http.session.get.call_count, 2)
+        
+        
+    def test_hits_are_not_processed_again(self):
+        processed = []
+        client = CollectionClient(self.http, 'foo', {
+            'list': {'process': {'n': lambda v: processed.append(v) or v + 1}}
+        }, {})
+        self.http.session.get = Mock(side_effect=[
+            response(data={'data': [{'n': 1}]}, headers={'ETag': '"v1"'}),
+            response(status_code=304)
+        ])
+        
+        client.list()
+        client.list()
+        self.now[0] = 11
+        res = client.list()
+        
+        self.assertEqual(res, [{'n': 2}])
+        self.assertEqual(processed, [1])
+        
+        
+    def test_stale_entries_are_revalidated(self):
+        self.http.session.get = Mock(side_effect=[
+            response(data={'data': [{'n': 1}]}, headers={'ETag': '"v1"', 'Last-Modified': 'yesterday'}),
+            response(status_code=304)
+        ])
+        
+        self.client.list()
+        self.now[0] = 11
+        res = self.client.list()
+        
+        self.assertEqual(res, [{'n': 2}])
+        self.http.session.get.assert_called_with('http://endpointfoo/', data={}, 
+            headers={'If-None-Match': '"v1"', 'If-Modified-Since': 'yesterday'})
+        self.now[0] = 20
+        self.client.list()
+        self.assertEqual(self.http.session.get.call_count, 2)
+        
+        
+    def test_writes_invalidate(self):
+        self.http.session.get = Mock(return_value=response(data={'data': {'id': 1}}))
+        self.http.session.put = Mock(return_value=response(data={'data': {'id': 1}}))
+        
+        self.client.show(1)
+        self.client.update(1)
+        self.client.show(1)
+        
+        self.assertEqual(self.http.session.get.call_count, 2)
+        
+        
+    def test_per_collection_ttl(self):
+        client = CollectionClient(self.http, 'foo/1/bar', {'list': {}}, {})
+        self.http.session.get = Mock(return_value=response(data={'data': []}))
+        
+        client.list()
+        self.now[0] = 50
+        client.list()
+        
+        self.assertEqual(self.http.session.get.call_count, 1)
+        
+        
+    def test_lru_eviction(self):
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual(sorted(lru.keys()), ['a', 'c'])
+
+
+class TestDiskCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'cache.db')
+        self.now = [0]
+        
+        
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        
+        
+    def client(self, token='abc123', **kwargs):
+        cache = DiskCache(self.path, ttl=10, clock=lambda: self.now[0], **kwargs)
+        http = HTTPClient(token, 'http://endpoint', cache=cache)
+        http.session.get = Mock(return_value=response(data={'data': [{'n': 1}]}))
+        http.session.put = Mock(return_value=response(data={'data': {'id': 1}}))
+        return CollectionClient(http, 'foo', {
+            'list': {'optional': ['page'], 'process': {'n': lambda v: v + 1}},
+            'update': {}
+        }, {})
+        
+        
+    def test_shared_between_clients(self):
+        first, second = self.client(), self.client()
+        
+        self.assertEqual(first.list(), [{'n': 2}])
+        self.assertEqual(second.list(), [{'n': 2}])
+        
+        self.assertEqual(first.http.session.get.call_count, 1)
+        self.assertEqual(second.http.session.get.call_count, 0)
+        self.now[0] = 11
+        second.list()
+        self.assertEqual(second.http.session.get.call_count, 1)
+        
+        
+    def test_scoped_by_token(self):
+        self.client('abc123').list()
+        other = self.client('def456')
+        other.list()
+        self.assertEqual(other.http.session.get.call_count, 1)
+        
+        
+    def test_writes_invalidate_other_clients(self):
+        first, second = self.client(), self.client()
+        first.list()
+        second.update(1)
+        first.list()
+        self.assertEqual(first.http.session.get.call_count, 2)
+        
+        
+    def test_size_eviction(self):
+        client = self.client(max_bytes=30)
+        cache = client.http.cache
+        client.list(page=1)
+        self.now[0] = 1
+        client.list(page=2)
+        
+        keys = [row[0] for row in cache.connection().execute('select key from entries')]
+        self.assertEqual(len(keys), 1)
+        self.assertTrue(keys[0].endswith('"page": 2}'))
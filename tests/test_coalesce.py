@@ -0,0 +1,81 @@
+import threading
+import unittest
+from tenthousandfeet import HTTPClient, CollectionClient, Error
+from . import MockHTTPResponse
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+        self.http = HTTPClient('abc123', 'http://endpoint', coalesce=True)
+        self.http.session.get = self.get
+        self.client = CollectionClient(self.http, 'foo', {
+            'list': {'optional': ['page']},
+            'show': {'process': {'n': lambda v: v + 1}}
+        }, {})
+
+
+    def get(self, url, data=None):
+        self.calls.append((url, data))
+        self.release.wait()
+        if url.endswith('/404'):
+            return MockHTTPResponse(404, data={'message': 'Not found'})
+        return MockHTTPResponse(data={'data': {'n': 1, 'tags': []}})
+
+
+    def run_concurrently(self, *calls):
+        results = [None] * len(calls)
+
+        def work(i, fn):
+            try:
+                results[i] = fn()
+            except Error, e:
+                results[i] = e
+
+        threads = [threading.Thread(target=work, args=(i, fn)) for i, fn in enumerate(calls)]
+        for thread in threads:
+            thread.start()
+        while len(self.http.flights) < len(set(calls)) or self.waiters() < len(calls) - len(set(calls)):
+            pass
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+
+    def waiters(self):
+        return sum(f.waiters for f in self.http.flights.flights.values())
+
+
+    def test_identical_requests_share_one_call(self):
+        show = lambda: self.client.show(42)
+        results = self.run_concurrently(show, show, show, show)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(results, [{'n': 2, 'tags': []}] * 4)
+        results[0]['tags'].append('x')
+        self.assertEqual([r['tags'] for r in results[1:]], [[], [], []])
+
+
+    def test_different_requests_are_not_shared(self):
+        first, second = lambda: self.client.list(), lambda: self.client.list(page=2)
+        self.run_concurrently(first, second)
+        self.assertEqual(len(self.calls), 2)
+
+
+    def test_errors_are_shared(self):
+        missing = lambda: self.client.show(404)
+        results = self.run_concurrently(missing, missing)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual([r.status_code for r in results], [404, 404])
+
+
+    def test_later_requests_make_a_new_call(self):
+        self.release.set()
+        self.client.show(42)
+        self.client.show(42)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.http.flights), 0)
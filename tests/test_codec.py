@@ -0,0 +1,53 @@
+import unittest
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, Error
+from tenthousandfeet.codec import Codec, codecs, get_codec
+from . import MockHTTPResponse
+
+
+class TestCodec(unittest.TestCase):
+    
+    def setUp(self):
+        self.decoded = []
+        def loads(content):
+            self.decoded.append(content)
+            return codecs['json'].loads(content)
+        self.codec = Codec('counting', loads, codecs['json'].dumps)
+        self.http = HTTPClient('abc123', 'http://endpoint', codec=self.codec)
+        self.client = CollectionClient(self.http, 'foo', {'show': {}}, {})
+        
+        
+    def test_get_codec(self):
+        self.assertIs(get_codec('json'), codecs['json'])
+        self.assertIn(get_codec().name, codecs)
+        self.assertIs(get_codec(self.codec), self.codec)
+        with self.assertRaises(ValueError):
+            get_codec('nope')
+            
+            
+    def test_responses_are_decoded_once(self):
+        self.http.session.get = Mock(return_value=MockHTTPResponse(data={'data': {'id': 1}}))
+        
+        self.assertEqual(self.client.show(1), {'id': 1})
+        self.assertEqual(self.decoded, ['{"data": {"id": 1}}'])
+        
+        
+    def test_errors_are_decoded_once(self):
+        self.http.session.get = Mock(return_value=MockHTTPResponse(404, data={'message': 'Not found'}))
+        
+        with self.assertRaises(Error) as e:
+            self.client.show(1)
+        
+        self.assertEqual(str(e.exception), 'Not found')
+        self.assertEqual(len(self.decoded), 1)
+        
+        
+    def test_undecodable_error(self):
+        res = MockHTTPResponse(502, reason='Bad Gateway')
+        res.content = '<html>'
+        self.http.session.get = Mock(return_value=res)
+        
+        with self.assertRaises(Error) as e:
+            self.client.show(1)
+        
+        self.assertEqual(str(e.exception), 'Bad Gateway')
@@ -191,4 +191,38 @@ class TestCollection(unittest.TestCase):
         client.http.get = make_mock_response_obj()
         client.list(___from='from')
         client.http.get.assert_called_with(path='foo/', data={'from':'from'})
-        
\ No newline at end of file
+        
+        
+    def test_required_arg_with_prefixed_underscores(self):
+        client = CollectionClient(self.http, 'foo', {'list': {'required': ['from']} }, {})
+        client.http.get = make_mock_response_obj()
+        client.list(_from='from')
+        client.http.get.assert_called_with(path='foo/', data={'from':'from'})
+        
+        
+    def test_sub_collection_specs_compiled_once(self):
+        client = CollectionClient(self.http, 'foo', {}, {'bar': {'methods': {'list': {}}}})
+        self.assertIs(client.bar(1).specs, client.bar(2).specs)
+        
+        
+    def test_sub_collection_clients_are_interned(self):
+        client = CollectionClient(self.http, 'foo', {}, {'bar': {'methods': {'list': {}}}})
+        self.assertIs(client.bar(1), client.bar(1))
+        self.assertIsNot(client.bar(1), client.bar(2))
+        
+        
+    def test_sub_collection_cache_is_bounded(self):
+        client = CollectionClient(self.http, 'foo', {}, {'bar': {'methods': {'list': {}}}})
+        client.sub_collection_cache_size = 3
+        clients = [client.bar(i) for i in range(10)]
+        self.assertEqual(len(client.bar.clients), 3)
+        self.assertEqual(clients[9].name, 'foo/9/bar')
+        
+        
+    def test_sub_collection_factories_are_lazy(self):
+        client = CollectionClient(self.http, 'foo', {}, {'bar': {'methods': {'list': {}}}})
+        self.assertNotIn('bar', client.__dict__)
+        client.bar
+        self.assertIn('bar', client.__dict__)
+        with self.assertRaises(AttributeError):
+            client.baz
@@ -0,0 +1,98 @@
+import gzip
+import json
+import threading
+import unittest
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from StringIO import StringIO
+from tenthousandfeet import TenThousandFeet, HTTPClient
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self.server.headers.append(dict(self.headers))
+        text = json.dumps({'data': {'id': 1}})
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            buf = StringIO()
+            f = gzip.GzipFile(fileobj=buf, mode='wb')
+            f.write(text)
+            f.close()
+            text = buf.getvalue()
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(text)))
+        self.end_headers()
+        self.wfile.write(text)
+
+
+class Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.headers = []
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d/' % self.server_address[1]
+
+
+class TestConnections(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server()
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def test_shared_client_reuses_connections(self):
+        client = TenThousandFeet('abc123', endpoint=self.server.url, pool_size=8, timeout=(5, 5))
+        results = []
+
+        def work():
+            for i in range(25):
+                results.append(client.projects.show(i))
+
+        threads = [threading.Thread(target=work) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 200)
+        self.assertEqual(results[0], {'id': 1})
+        self.assertLessEqual(self.server.connections, 8)
+
+
+    def test_compression_and_keep_alive(self):
+        HTTPClient('abc123', self.server.url, keep_alive=False).get('projects/1')
+        HTTPClient('abc123', self.server.url, compress=False).get('projects/1')
+
+        self.assertEqual(self.server.headers[0]['accept-encoding'], 'gzip, deflate')
+        self.assertEqual(self.server.headers[0]['connection'], 'close')
+        self.assertEqual(self.server.headers[1]['accept-encoding'], 'identity')
+        self.assertEqual(self.server.headers[1]['connection'], 'keep-alive')
@@ -0,0 +1,61 @@
+import json
+import unittest
+from copy import deepcopy
+from StringIO import StringIO
+from mock import Mock
+from tenthousandfeet import TenThousandFeet, TEST_URL
+from tenthousandfeet.export import export
+from . import MockHTTPResponse
+
+
+class TestExport(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = TenThousandFeet('abc123', endpoint=TEST_URL)
+        self.client.http.session.get = Mock(side_effect=self.get)
+        self.requests = []
+        
+        
+    def get(self, url, data, stream=False):
+        path = url[len(TEST_URL):].rstrip('/')
+        self.requests.append((path, data))
+        if path == 'users':
+            items = [{'id': i} for i in range(5)]
+        elif path == 'projects':
+            items = [{'id': 1, 'name': u'caf\xe9', 'created_at': '2014-07-23T00:22:24Z', 'settings': {'a': 1}}]
+        else:
+            user_id = int(path.split('/')[1])
+            items = [{'id': user_id * 10 + i, 'user_id': user_id, 'date': '2014-07-0%d' % (i + 1), 'hours': 1} for i in range(3)]
+        res = MockHTTPResponse(data={'data': items, 'paging': {}})
+        res.content = json.dumps(res._data)
+        res.iter_content = lambda size: iter([res.content])
+        res.close = lambda: None
+        return res
+        
+        
+    def test_export_ndjson(self):
+        out = StringIO()
+        count = export(self.client, 'projects', out)
+        
+        self.assertEqual(count, 1)
+        row = json.loads(out.getvalue())
+        self.assertEqual(row['created_at'], '2014-07-23T00:22:24+0000')
+        self.assertEqual(row['name'], u'caf\xe9')
+        
+        
+    def test_export_nested_csv(self):
+        out = StringIO()
+        count = export(self.client, 'users.time_entries', out, format='csv', 
+                       kwargs={'from': '2014-07-01'}, concurrency=3)
+        
+        lines = out.getvalue().splitlines()
+        self.assertEqual(count, 15)
+        self.assertEqual(lines[0], 'date,hours,id,user_id')
+        self.assertIn('2014-07-01T00:00:00,1,20,2', lines)
+        self.assertIn(('users/4/time_entries', {'from': '2014-07-01'}), self.requests)
+        
+        
+    def test_csv_nested_values(self):
+        out = StringIO()
+        export(self.client, 'projects', out, format='csv', fields=['name', 'settings'])
+        self.assertEqual(out.getvalue().splitlines()[1], 'caf\xc3\xa9,"{""a"": 1}"')
@@ -0,0 +1,58 @@
+import unittest
+from datetime import date
+from tenthousandfeet import TenThousandFeet, Error
+from tenthousandfeet.fake import FakeAPI
+
+
+class TestFakeAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        self.client = TenThousandFeet('abc123', session=self.api)
+
+
+    def test_create_show_update_delete(self):
+        project = self.client.projects.create(name='Foo', starts_at=date(2014, 7, 1))
+        self.assertEqual(project['name'], 'Foo')
+        self.assertEqual(project['starts_at'].date(), date(2014, 7, 1))
+
+        self.client.projects.update(project['id'], name='Bar')
+        self.assertEqual(self.client.projects.show(project['id'])['name'], 'Bar')
+
+        self.client.projects.delete(project['id'])
+        with self.assertRaises(Error) as e:
+            self.client.projects.show(project['id'])
+        self.assertEqual(e.exception.status_code, 404)
+
+
+    def test_required_arguments(self):
+        self.api.add('projects', id=1, name='Foo')
+        with self.assertRaises(Error) as e:
+            self.client.http.get('projects/1/budget_items/')
+        self.assertEqual(e.exception.status_code, 422)
+
+
+    def test_unsupported_method(self):
+        with self.assertRaises(Error) as e:
+            self.client.http.delete('users/1')
+        self.assertEqual(e.exception.status_code, 405)
+
+
+    def test_list_pages_and_filters(self):
+        self.api.load('users/5/time_entries', [
+            {'date': '2014-07-%02d' % (i % 28 + 1), 'hours': 1} for i in range(50)])
+
+        entries = list(self.client.users.time_entries(5).iter_list(
+            _from=date(2014, 7, 1), to=date(2014, 7, 10), per_page=7))
+
+        self.assertEqual(len(entries), 20)
+        self.assertTrue(all(e['user_id'] == 5 for e in entries))
+        self.assertTrue(all(date(2014, 7, 1) <= e['date'].date() <= date(2014, 7, 10) for e in entries))
+        self.assertEqual(self.client.users.time_entries(6).list(), [])
+
+
+    def test_archived_projects(self):
+        self.api.add('projects', name='Old', archived=True)
+        self.api.add('projects', name='New', archived=False)
+        self.assertEqual([p['name'] for p in self.client.projects.list()], ['New'])
+        self.assertEqual(len(self.client.projects.list(with_archived=True)), 2)
@@ -0,0 +1,81 @@
+import unittest
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, Metrics, Scheduler, Error, TenThousandFeet
+from tenthousandfeet.fake import FakeAPI, FakeResponse
+from . import MockHTTPResponse
+
+
+def response(status_code=200, data=None, size=None):
+    res = MockHTTPResponse(status_code=status_code, data=data or {'data': [{'n': 1}, {'n': 2}]})
+    res.headers = {'Content-Length': str(size)} if size else {}
+    return res
+
+
+class TestMetrics(unittest.TestCase):
+    
+    def setUp(self):
+        self.http = HTTPClient('abc123', 'http://endpoint', 
+                               scheduler=Scheduler(sleep=lambda s: None))
+        self.metrics = Metrics().install(self.http)
+        self.client = CollectionClient(self.http, 'foo/1/bar', 
+            {'list': {'process': {'n': lambda v: v}}, 'create': {}}, {})
+        
+        
+    def test_hooks(self):
+        events = []
+        self.http.add_hook('before_request', lambda **info: events.append(('before_request', info['url'])))
+        self.http.add_hook('before_call', lambda **info: events.append(('before_call', info['collection'])))
+        self.http.session.get = Mock(return_value=response())
+        
+        self.client.list()
+        
+        self.assertEqual(events, [('before_call', 'foo.bar'), ('before_request', 'http://endpointfoo/1/bar/')])
+        
+        
+    def test_collects_metrics(self):
+        self.http.session.get = Mock(side_effect=[response(429, size=3), response(size=10)])
+        self.http.session.post = Mock(return_value=response(422, size=5))
+        
+        self.client.list()
+        with self.assertRaises(Error):
+            self.client.create(name='abc')
+        
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['calls']['foo.bar.list']['count'], 1)
+        self.assertEqual(metrics['errors'], {'foo.bar.create': 1})
+        self.assertEqual(metrics['statuses'], {'REQUEST 429': 1, 'REQUEST 200': 1, 'REQUEST 422': 1})
+        self.assertEqual(metrics['retries'], {'REQUEST 429': 1})
+        self.assertEqual(metrics['bytes_sent'], len('name=abc'))
+        self.assertEqual(metrics['bytes_received'], 18)
+        self.assertEqual(metrics['items'], {'foo.bar.list': 2})
+        self.assertIn('foo.bar.list', metrics['process_seconds'])
+        
+        
+    def test_prometheus(self):
+        self.http.session.get = Mock(return_value=response())
+        self.client.list()
+        
+        text = self.metrics.to_prometheus()
+        
+        self.assertIn('# TYPE tenthousandfeet_call_duration_seconds histogram', text)
+        self.assertIn('tenthousandfeet_call_duration_seconds_count{collection="foo.bar",method="list"} 1', text)
+        self.assertIn('tenthousandfeet_call_duration_seconds_bucket{collection="foo.bar",method="list",le="+Inf"} 1', text)
+        self.assertIn('tenthousandfeet_items_total{collection="foo.bar",method="list"} 2', text)
+        
+        
+    def test_paged_and_streamed_calls(self):
+        api = FakeAPI()
+        api.load('projects', [{'name': 'Project %d' % i} for i in range(5)])
+        client = TenThousandFeet('abc123', session=api)
+        metrics = Metrics().install(client.http)
+        
+        self.assertEqual(len(list(client.projects.iter_list(per_page=2))), 5)
+        self.assertEqual(len(list(client.projects.stream_list(per_page=2))), 5)
+        api.get = lambda url, **kwargs: FakeResponse(503, {'message': 'Unavailable'})
+        with self.assertRaises(Error):
+            list(client.projects.stream_list())
+        
+        metrics = metrics.as_dict()
+        self.assertEqual(metrics['calls']['projects.list']['count'], 7)
+        self.assertEqual(metrics['errors'], {'projects.list': 1})
+        self.assertEqual(metrics['items'], {'projects.list': 10})
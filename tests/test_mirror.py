@@ -0,0 +1,92 @@
+import unittest
+from copy import deepcopy
+from datetime import date, datetime, timedelta
+from mock import Mock
+from tenthousandfeet import TenThousandFeet, TEST_URL
+from tenthousandfeet.mirror import Mirror
+from . import MockHTTPResponse
+
+
+class FakeAPI(object):
+    
+    def __init__(self):
+        self.projects = [{'id': 1, 'name': 'A', 'updated_at': '2014-01-01T00:00:00Z'}]
+        self.users = [{'id': 7, 'first_name': 'Ann'}]
+        self.time_entries = {7: [{'id': 100, 'date': '2014-01-02', 'hours': 8, 'updated_at': 'v1'}]}
+        self.requests = []
+        
+    def get(self, url, data):
+        path = url[len(TEST_URL):].rstrip('/')
+        self.requests.append((path, data))
+        parts = path.split('/')
+        if parts == ['projects']:
+            items = self.projects
+        elif parts == ['users']:
+            items = self.users
+        else:
+            items = [e for e in self.time_entries.get(int(parts[1]), []) 
+                     if 'from' not in data or e['date'] >= data['from']]
+        return MockHTTPResponse(data={'data': deepcopy(items), 'paging': {}})
+
+
+class TestMirror(unittest.TestCase):
+    
+    def setUp(self):
+        self.api = FakeAPI()
+        self.client = TenThousandFeet('abc123', endpoint=TEST_URL)
+        self.client.http.session.get = Mock(side_effect=self.api.get)
+        self.mirror = Mirror(self.client, ':memory:', lookback=timedelta(days=7))
+        
+        
+    def tearDown(self):
+        self.mirror.close()
+        
+        
+    def test_initial_sync(self):
+        self.assertEqual(self.mirror.sync(), {'projects': 1, 'users': 1, 'time_entries': 1})
+        
+        project = self.mirror.get('projects', 1)
+        self.assertEqual(project['name'], 'A')
+        self.assertEqual(project['updated_at'].year, 2014)
+        entries = list(self.mirror.rows('time_entries', parent_id=7))
+        self.assertEqual(entries[0]['date'], datetime(2014, 1, 2))
+        self.assertEqual(entries[0]['hours'], 8)
+        
+        
+    def test_incremental_sync(self):
+        self.mirror.sync()
+        self.api.requests = []
+        self.api.projects.append({'id': 2, 'name': 'B', 'updated_at': '2014-01-01T00:00:00Z'})
+        self.api.time_entries[7] = [{'id': 101, 'date': date.today().isoformat(), 'hours': 2, 'updated_at': 'v1'}]
+        
+        self.assertEqual(self.mirror.sync(), {'projects': 1, 'users': 0, 'time_entries': 1})
+        
+        window_start = (date.today() - timedelta(days=7)).isoformat()
+        self.assertIn(('users/7/time_entries', {'from': window_start}), self.api.requests)
+        self.assertEqual([e['id'] for e in self.mirror.rows('time_entries')], [100, 101])
+        
+        
+    def test_removed_rows(self):
+        self.mirror.sync()
+        self.api.projects = []
+        self.mirror.sync_projects()
+        self.assertEqual(self.mirror.get('projects', 1), None)
+        
+        
+    def test_rows_without_updated_at(self):
+        self.mirror.sync()
+        self.api.users[0]['first_name'] = 'Anne'
+        
+        self.assertEqual(self.mirror.sync_users(), 1)
+        self.assertEqual(self.mirror.get('users', 7)['first_name'], 'Anne')
+        self.assertEqual(self.mirror.sync_users(), 0)
+        
+        
+    def test_time_entries_without_updated_at(self):
+        self.api.time_entries[7] = [{'id': 100, 'date': date.today().isoformat(), 'hours': 8}]
+        self.mirror.sync()
+        
+        self.assertEqual(self.mirror.sync_time_entries(), 0)
+        self.api.time_entries[7][0]['hours'] = 6
+        self.assertEqual(self.mirror.sync_time_entries(), 1)
+        self.assertEqual(self.mirror.get('time_entries', 100)['hours'], 6)
@@ -0,0 +1,63 @@
+import unittest
+from mock import Mock, call
+from tenthousandfeet import HTTPClient, CollectionClient
+from . import MockHTTPResponse
+
+
+def page(items, next_url=None):
+    return MockHTTPResponse(data={
+        'data': items,
+        'paging': {'next': next_url}
+    })
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.http = HTTPClient('abc123', 'http://endpoint')
+
+
+    def test_iter_list_follows_paging(self):
+        client = CollectionClient(self.http, 'foo', {'list': {'optional': ['bar']} }, {})
+        client.http.get = Mock(side_effect=[
+            page([{'id': 1}, {'id': 2}], '/api/v1/foo?page=2&per_page=2'),
+            page([{'id': 3}], None)
+        ])
+
+        res = [item['id'] for item in client.iter_list(bar=123, per_page=2)]
+
+        self.assertEqual(res, [1, 2, 3])
+        self.assertEqual(client.http.get.call_args_list, [
+            call(path='foo/', data={'bar': 123, 'per_page': 2}),
+            call(path='foo/', data={'bar': 123, 'per_page': '2', 'page': '2'})
+        ])
+
+
+    def test_iter_list_stops_on_empty_page(self):
+        client = CollectionClient(self.http, 'foo', {'list': {} }, {})
+        client.http.get = Mock(side_effect=[
+            page([], '/api/v1/foo?page=2')
+        ])
+
+        self.assertEqual(list(client.iter_list()), [])
+        self.assertEqual(client.http.get.call_count, 1)
+
+
+    def test_iter_list_processes_items(self):
+        def add_one(val):
+            return val + 1
+
+        client = CollectionClient(self.http, 'foo', {'list': {'process': {'bar': add_one}} }, {})
+        client.http.get = Mock(side_effect=[
+            page([{'bar': 1}], '/api/v1/foo?page=2'),
+            page([{'bar': 5}])
+        ])
+
+        self.assertEqual([item['bar'] for item in client.iter_list()], [2, 6])
+
+
+    def test_iter_list_requires_method(self):
+        client = CollectionClient(self.http, 'foo', {}, {})
+
+        with self.assertRaises(Exception):
+            client.iter_list()
@@ -0,0 +1,41 @@
+import unittest
+from tenthousandfeet import parse_date, date_parse
+
+
+samples = [
+    '1982-09-06',
+    '1982-09-06T08:34:00Z',
+    '2014-07-23T00:22:24Z',
+    '2014-07-23T00:22:24.123Z',
+    '2014-07-23T00:22:24.1234567Z',
+    '2014-07-23T00:22:24+00:00',
+    '2014-07-23T00:22:24-07:00',
+    '2014-07-23T00:22:24+0530',
+    '2014-07-23T00:22:24+05',
+    '2014-07-23T00:22:24',
+    '2014-07-23 00:22',
+]
+
+
+class TestParseDate(unittest.TestCase):
+    
+    def test_matches_dateutil(self):
+        for value in samples:
+            expected = date_parse(value)
+            result = parse_date(value)
+            self.assertEqual(result, expected, value)
+            self.assertEqual(result.utcoffset(), expected.utcoffset(), value)
+            
+            
+    def test_falls_back_to_dateutil(self):
+        self.assertEqual(parse_date('Sep 6 1982'), date_parse('Sep 6 1982'))
+        self.assertEqual(parse_date(u'1982-09-06'), date_parse('1982-09-06'))
+        
+        
+    def test_invalid_dates(self):
+        with self.assertRaises(ValueError):
+            parse_date('1982-02-30')
+            
+            
+    def test_repeated_values_are_shared(self):
+        self.assertIs(parse_date('2001-01-01'), parse_date('2001-01-01'))
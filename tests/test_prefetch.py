@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime
+from tenthousandfeet import TenThousandFeet, Error
+from tenthousandfeet.fake import FakeAPI
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        for user_id in (1, 2, 3):
+            self.api.add('users', id=user_id, first_name='User %d' % user_id)
+            self.api.load('users/%d/time_entries' % user_id, [
+                {'date': '2014-07-0%d' % day, 'hours': user_id} for day in range(1, user_id + 1)])
+            self.api.add('users/%d/statuses' % user_id, status='busy')
+
+
+    def test_children_are_attached(self):
+        client = TenThousandFeet('abc123', session=self.api)
+        users = client.users.list(prefetch=['time_entries', 'statuses'], prefetch_concurrency=4)
+
+        self.assertEqual([len(u['time_entries']) for u in users], [1, 2, 3])
+        self.assertEqual([u['statuses'][0]['status'] for u in users], ['busy'] * 3)
+        self.assertEqual(users[2]['time_entries'][0]['date'], datetime(2014, 7, 1))
+
+
+    def test_children_arguments(self):
+        client = TenThousandFeet('abc123', session=self.api)
+        users = client.users.list(prefetch={'time_entries': {'_from': '2014-07-02'}})
+        self.assertEqual([len(u['time_entries']) for u in users], [0, 1, 2])
+
+
+    def test_failures_are_attached(self):
+        session_get = self.api.get
+        def get(url, **kwargs):
+            if 'users/2/' in url:
+                return self.api.handle('GET', 'users/2/nothing', None)
+            return session_get(url, **kwargs)
+        self.api.get = get
+        client = TenThousandFeet('abc123', session=self.api)
+
+        users = client.users.list(prefetch=['time_entries'])
+
+        self.assertIsInstance(users[1]['time_entries'], Error)
+        self.assertEqual(users[1]['time_entries'].status_code, 404)
+        self.assertEqual(len(users[2]['time_entries']), 3)
+
+
+    def test_records(self):
+        client = TenThousandFeet('abc123', session=self.api, records=True)
+        users = client.users.list(prefetch=['time_entries'])
+
+        self.assertEqual(users[0].first_name, 'User 1')
+        self.assertEqual(users[0].time_entries[0].date, datetime(2014, 7, 1))
+
+
+    def test_unknown_sub_collection(self):
+        client = TenThousandFeet('abc123', session=self.api)
+        with self.assertRaises(Exception):
+            client.users.list(prefetch=['phases'])
@@ -0,0 +1,76 @@
+import json
+import unittest
+from copy import deepcopy
+from datetime import datetime
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, Record, TenThousandFeet, TEST_URL
+from . import MockHTTPResponse, make_mock_response_obj
+
+
+class TestRecords(unittest.TestCase):
+    
+    def setUp(self):
+        self.http = HTTPClient('abc123', 'http://endpoint')
+        self.decoded = []
+        def decode(value):
+            self.decoded.append(value)
+            return datetime.strptime(value, '%Y-%m-%d')
+        self.client = CollectionClient(self.http, 'foo', {
+            'list': {'process': {'date': decode, 'nested.date': decode}},
+        }, {}, records=True)
+        
+        
+    def mock_list(self, items):
+        body = json.loads(json.dumps({'data': items}))
+        self.client.http.get = make_mock_response_obj(body)
+        return self.client.list()
+        
+        
+    def test_fields_decoded_on_first_read(self):
+        res = self.mock_list([{'id': 1, 'date': '2014-01-01'}, {'id': 2, 'date': None}])
+        
+        self.assertIsInstance(res[0], Record)
+        self.assertEqual(self.decoded, [])
+        self.assertEqual(res[0].date, datetime(2014, 1, 1))
+        self.assertEqual(res[0]['date'], datetime(2014, 1, 1))
+        self.assertEqual(self.decoded, ['2014-01-01'])
+        self.assertEqual(res[1].date, None)
+        self.assertEqual(res[1]['id'], 2)
+        
+        
+    def test_nested_fields(self):
+        res = self.mock_list([{'id': 1, 'nested': {'date': '2014-01-01'}}])
+        self.assertEqual(res[0].nested, {'date': datetime(2014, 1, 1)})
+        
+        
+    def test_records_are_compact(self):
+        res = self.mock_list([{'id': 1, 'date': '2014-01-01'}])
+        
+        with self.assertRaises(AttributeError):
+            res[0].__dict__
+        with self.assertRaises(KeyError):
+            res[0]['missing']
+        self.assertEqual(res[0].get('missing', 3), 3)
+        self.assertEqual(sorted(res[0].keys()), ['date', 'id'])
+        
+        
+    def test_records_compare_and_copy(self):
+        res = self.mock_list([{'id': 1, 'date': '2014-01-01'}])
+        
+        copied = deepcopy(res[0])
+        
+        self.assertEqual(copied, {'id': 1, 'date': datetime(2014, 1, 1)})
+        self.assertEqual(copied.to_dict(), res[0].to_dict())
+        copied['id'] = 2
+        self.assertEqual(res[0].id, 1)
+        
+        
+    def test_unusual_keys_stay_dicts(self):
+        res = self.mock_list([{'id': 1, 'not-a-name': 2}, {'keys': 1}])
+        self.assertEqual(res, [{'id': 1, 'not-a-name': 2}, {'keys': 1}])
+        self.assertFalse(isinstance(res[0], Record))
+        
+        
+    def test_sub_collections_return_records(self):
+        client = TenThousandFeet('abc123', endpoint=TEST_URL, records=True)
+        self.assertTrue(client.users.time_entries(1).records)
@@ -0,0 +1,89 @@
+import unittest
+from mock import Mock
+from tenthousandfeet import HTTPClient, Scheduler, TokenBucket, Error
+from tenthousandfeet.scheduler import AdaptiveLimit, parse_retry_after
+from . import MockHTTPResponse
+
+
+def response(status_code, headers=None):
+    res = MockHTTPResponse(status_code=status_code, data={'data': {}})
+    res.headers = headers or {}
+    return res
+
+
+class TestScheduler(unittest.TestCase):
+    
+    def setUp(self):
+        self.sleeps = []
+        self.scheduler = Scheduler(retries=3, backoff=1, sleep=self.sleeps.append)
+        self.http = HTTPClient('abc123', 'http://endpoint', scheduler=self.scheduler)
+        
+        
+    def test_retries_throttled_requests(self):
+        self.http.session.get = Mock(side_effect=[
+            response(429, {'Retry-After': '7'}),
+            response(503),
+            response(200)
+        ])
+        
+        self.http.get('foo/')
+        
+        self.assertEqual(self.http.session.get.call_count, 3)
+        self.assertEqual(self.sleeps[0], 7)
+        self.assertTrue(0 <= self.sleeps[1] <= 2)
+        
+        
+    def test_gives_up_after_retries(self):
+        self.http.session.get = Mock(return_value=response(502))
+        
+        with self.assertRaises(Error) as context:
+            self.http.get('foo/')
+            
+        self.assertEqual(context.exception.status_code, 502)
+        self.assertEqual(self.http.session.get.call_count, 4)
+        
+        
+    def test_post_only_retried_when_refused(self):
+        self.http.session.post = Mock(side_effect=[response(429), response(500)])
+        
+        with self.assertRaises(Error):
+            self.http.post('foo/')
+            
+        self.assertEqual(self.http.session.post.call_count, 2)
+        
+        
+    def test_throttling_reduces_concurrency(self):
+        self.http.session.get = Mock(side_effect=[response(429), response(429), response(200)])
+        self.http.get('foo/')
+        self.assertEqual(self.scheduler.limit.limit, 2.5 + 1 / 2.5)
+        
+        
+    def test_adaptive_limit_bounds(self):
+        limit = AdaptiveLimit(4, minimum=1)
+        for i in range(5):
+            limit.throttled()
+        self.assertEqual(limit.limit, 1)
+        for i in range(100):
+            limit.succeeded()
+        self.assertEqual(limit.limit, 4)
+        
+        
+    def test_token_bucket(self):
+        now = [0.0]
+        sleeps = []
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+        bucket = TokenBucket(2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        
+        for i in range(4):
+            bucket.acquire()
+            
+        self.assertEqual(sleeps, [0.5, 0.5])
+        
+        
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('12'), 12)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertEqual(parse_retry_after('soon'), None)
+        self.assertEqual(parse_retry_after(None), None)
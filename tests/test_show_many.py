@@ -0,0 +1,81 @@
+import unittest
+import requests
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, Error
+from . import MockHTTPResponse
+
+
+class TestShowMany(unittest.TestCase):
+    
+    def setUp(self):
+        self.http = HTTPClient('abc123', 'http://endpoint')
+        
+        
+    def mock_get(self, path, data):
+        object_id = path.split('/')[-1]
+        if object_id == 'down':
+            raise requests.ConnectionError('Connection refused')
+        if object_id == 'missing':
+            return MockHTTPResponse(status_code=404, data={'message': 'Not found'})
+        return MockHTTPResponse(data={'data': {'id': object_id, 'fields': data.get('fields')}})
+        
+        
+    def test_results_in_input_order(self):
+        client = CollectionClient(self.http, 'foo', {'show': {'optional': ['fields']} }, {})
+        client.http.session.get = Mock(side_effect=lambda url, data: self.mock_get(url, data))
+        ids = [str(i) for i in range(20)]
+        
+        res = list(client.show_many(ids, fields='name'))
+        
+        self.assertEqual([object_id for object_id, _ in res], ids)
+        self.assertEqual([item['id'] for _, item in res], ids)
+        self.assertEqual(res[0][1]['fields'], 'name')
+        
+        
+    def test_unordered_results(self):
+        client = CollectionClient(self.http, 'foo', {'show': {} }, {})
+        client.http.session.get = Mock(side_effect=lambda url, data: self.mock_get(url, data))
+        ids = [str(i) for i in range(20)]
+        
+        res = dict(client.show_many(ids, ordered=False, concurrency=3))
+        
+        self.assertEqual(sorted(res.keys()), sorted(ids))
+        
+        
+    def test_errors_are_collected(self):
+        client = CollectionClient(self.http, 'foo', {'show': {} }, {})
+        client.http.session.get = Mock(side_effect=lambda url, data: self.mock_get(url, data))
+        
+        res = dict(client.show_many(['1', 'missing', '2']))
+        
+        self.assertIsInstance(res['missing'], Error)
+        self.assertEqual(res['missing'].status_code, 404)
+        self.assertEqual(res['2']['id'], '2')
+        
+        
+    def test_connection_errors_are_collected(self):
+        client = CollectionClient(self.http, 'foo', {'show': {} }, {})
+        client.http.session.get = Mock(side_effect=lambda url, data: self.mock_get(url, data))
+        
+        res = dict(client.show_many(['1', 'down', '2'], concurrency=1))
+        
+        self.assertIsInstance(res['down'], requests.ConnectionError)
+        self.assertEqual(res['1']['id'], '1')
+        self.assertEqual(res['2']['id'], '2')
+        
+        
+    def test_input_errors_are_raised(self):
+        client = CollectionClient(self.http, 'foo', {'show': {} }, {})
+        client.http.session.get = Mock(side_effect=lambda url, data: self.mock_get(url, data))
+        def ids():
+            yield '1'
+            raise ValueError('bad id')
+        
+        with self.assertRaises(ValueError):
+            list(client.show_many(ids(), concurrency=2))
+        
+        
+    def test_concurrency_must_be_positive(self):
+        client = CollectionClient(self.http, 'foo', {'show': {} }, {})
+        with self.assertRaises(AssertionError):
+            client.show_many(['1'], concurrency=0)
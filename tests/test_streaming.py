@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+from mock import Mock
+from tenthousandfeet import HTTPClient, CollectionClient, Scheduler
+from tenthousandfeet.streaming import iter_items
+
+
+def chunked(text, size):
+    return [text[i:i+size] for i in range(0, len(text), size)]
+
+
+class StreamingResponse(object):
+    
+    def __init__(self, body, size=7, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = json.dumps(body)
+        self.size = size
+        self.closed = False
+        
+    def iter_content(self, chunk_size):
+        return iter(chunked(self.content, self.size))
+        
+    def close(self):
+        self.closed = True
+
+
+class TestStreaming(unittest.TestCase):
+    
+    def test_iter_items_across_chunk_boundaries(self):
+        body = {
+            'paging': {'next': None, 'page': 1},
+            'data': [{'id': 1, 'name': u'caf\xe9 ☃'}, 12345, [1, {'a': 'b'}], None, 'x'],
+            'after': 1.5
+        }
+        text = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        for size in range(1, 12):
+            rest = {}
+            items = list(iter_items(chunked(text, size), 'data', rest))
+            self.assertEqual(items, body['data'])
+            self.assertEqual(rest, {'paging': body['paging'], 'after': 1.5})
+            
+            
+    def test_iter_items_empty(self):
+        self.assertEqual(list(iter_items(['{ "data" : [ ] }'])), [])
+        self.assertEqual(list(iter_items(['{}'])), [])
+        
+        
+    def test_iter_items_truncated(self):
+        with self.assertRaises(ValueError):
+            list(iter_items(['{"data": [{"id": 1}, {"id"']))
+            
+            
+    def test_stream_list(self):
+        http = HTTPClient('abc123', 'http://endpoint')
+        client = CollectionClient(http, 'foo', {'list': {'process': {'n': lambda v: v + 1}} }, {})
+        responses = [
+            StreamingResponse({'data': [{'n': 1}, {'n': 2}], 'paging': {'next': '/foo?page=2'}}),
+            StreamingResponse({'data': [{'n': 3}], 'paging': {'next': None}})
+        ]
+        http.session.get = Mock(side_effect=responses)
+        
+        items = list(client.stream_list(per_page=2))
+        
+        self.assertEqual(items, [{'n': 2}, {'n': 3}, {'n': 4}])
+        http.session.get.assert_called_with('http://endpointfoo/', 
+            data={'per_page': 2, 'page': '2'}, stream=True)
+        self.assertTrue(all(res.closed for res in responses))
+        
+        
+    def test_retried_responses_are_closed(self):
+        http = HTTPClient('abc123', 'http://endpoint', scheduler=Scheduler(sleep=lambda seconds: None))
+        client = CollectionClient(http, 'foo', {'list': {}}, {})
+        responses = [
+            StreamingResponse({'message': 'Unavailable'}, status_code=503),
+            StreamingResponse({'data': [{'n': 1}], 'paging': {'next': None}})
+        ]
+        http.session.get = Mock(side_effect=responses)
+        
+        self.assertEqual(list(client.stream_list()), [{'n': 1}])
+        self.assertTrue(all(res.closed for res in responses))
@@ -0,0 +1,76 @@
+import unittest
+from tenthousandfeet import TenThousandFeet, Change
+from tenthousandfeet.fake import FakeAPI
+
+
+class TestWatch(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        self.client = TenThousandFeet('abc123', session=self.api)
+        self.api.add('projects', id=1, name='One', updated_at='2014-07-01T00:00:00Z')
+        self.api.add('projects', id=2, name='Two', updated_at='2014-07-01T00:00:00Z')
+        self.intervals = []
+        self.steps = []
+
+
+    def sleep(self, interval):
+        self.intervals.append(interval)
+        if self.steps:
+            self.steps.pop(0)()
+
+
+    def watch(self, polls, **kwargs):
+        return list(self.client.projects.watch(interval=60, min_interval=20, max_interval=100,
+                                               polls=polls, sleep=self.sleep, **kwargs))
+
+
+    def test_changes(self):
+        def change():
+            project = self.api.items['projects']['1']
+            project.update(name='Uno', updated_at='2014-07-02T00:00:00Z')
+            del self.api.items['projects']['2']
+            self.api.add('projects', id=3, name='Three', updated_at='2014-07-02T00:00:00Z')
+        self.steps = [change]
+
+        changes = self.watch(2)
+
+        self.assertEqual([(c.type, c.id) for c in changes], [('updated', 1), ('created', 3), ('deleted', 2)])
+        self.assertEqual(changes[0].item['name'], 'Uno')
+        self.assertEqual(changes[2], Change('deleted', 2, None))
+
+
+    def test_initial(self):
+        changes = self.watch(1, initial=True)
+        self.assertEqual([(c.type, c.id) for c in changes], [('created', 1), ('created', 2)])
+
+
+    def test_archived_projects_are_updates(self):
+        def archive():
+            self.api.items['projects']['2'].update(archived=True, updated_at='2014-07-03T00:00:00Z')
+        self.steps = [archive]
+
+        changes = self.watch(2)
+
+        self.assertEqual([(c.type, c.id) for c in changes], [('updated', 2)])
+
+
+    def test_interval_adapts(self):
+        def change():
+            self.api.add('projects', name='New')
+        self.steps = [lambda: None] * 3 + [change, change]
+
+        self.watch(7)
+
+        self.assertEqual(self.intervals, [60, 90, 100, 100, 50, 25])
+
+
+    def test_items_without_updated_at(self):
+        def change():
+            self.api.items['users/1/statuses']['10']['status'] = 'away'
+        self.api.add('users/1/statuses', id=10, status='busy')
+        self.steps = [change]
+
+        changes = list(self.client.users.statuses(1).watch(polls=2, sleep=self.sleep))
+
+        self.assertEqual([(c.type, c.id) for c in changes], [('updated', 10)])
@@ -0,0 +1,61 @@
+import unittest
+from datetime import date, datetime, timedelta
+from tenthousandfeet import TenThousandFeet, Windows
+from tenthousandfeet.fake import FakeAPI
+
+
+class TestWindows(unittest.TestCase):
+
+    def test_windows_cover_range(self):
+        windows = list(Windows(date(2014, 1, 1), datetime(2014, 3, 1, 12), 30, 100))
+        self.assertEqual(windows, [
+            (date(2014, 1, 1), date(2014, 1, 30)),
+            (date(2014, 1, 31), date(2014, 3, 1))
+        ])
+
+
+    def test_window_size_adapts(self):
+        windows = Windows(date(2014, 1, 1), date(2014, 12, 31), 30, 100)
+        windows.observe(500)
+        self.assertEqual(windows.days, 15)
+        windows.observe(50)
+        self.assertEqual(windows.days, 15)
+        windows.observe(10)
+        self.assertEqual(windows.days, 30)
+
+
+class TestIterWindows(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        self.client = TenThousandFeet('abc123', session=self.api)
+
+
+    def test_time_entries_in_order(self):
+        start = date(2014, 1, 1)
+        self.api.load('users/1/time_entries', [
+            {'date': (start + timedelta(days=i * 365 // 1000)).isoformat(), 'hours': 1} for i in range(1000)])
+
+        entries = list(self.client.users.time_entries(1).iter_windows(
+            start, date(2014, 12, 31), window=10, target_rows=50, per_page=20))
+
+        self.assertEqual(len(entries), 1000)
+        dates = [e['date'] for e in entries]
+        self.assertEqual(dates, sorted(dates))
+
+
+    def test_overlapping_items_once(self):
+        self.api.load('users/1/assignments', [
+            {'starts_at': '2014-01-01', 'ends_at': '2014-12-31'},
+            {'starts_at': '2014-06-01', 'ends_at': '2014-06-02'}
+        ])
+
+        assignments = list(self.client.users.assignments(1).iter_windows(
+            date(2014, 1, 1), date(2014, 12, 31), window=7))
+
+        self.assertEqual([a['id'] for a in assignments], [1, 2])
+
+
+    def test_requires_from_and_to(self):
+        with self.assertRaises(AssertionError):
+            list(self.client.users.iter_windows(date(2014, 1, 1), date(2014, 2, 1)))
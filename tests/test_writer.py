@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from tenthousandfeet import TenThousandFeet, CollectionClient
+from tenthousandfeet.fake import FakeAPI, FakeResponse
+from tenthousandfeet.writer import WriteBehind
+
+
+class TestWriteBehind(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'time_entries.spool')
+        self.api = FakeAPI()
+        self.client = TenThousandFeet('abc123', session=self.api)
+
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+    def spooled(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+
+    def test_writes_are_sent_in_the_background(self):
+        writer = WriteBehind(self.client, self.path, fsync=False)
+        for i in range(20):
+            writer.create(i % 3, date=date(2014, 7, i % 5 + 1), hours=i)
+        self.assertTrue(writer.flush(5))
+
+        entries = self.api.all('users/1/time_entries')
+        self.assertEqual(sorted(e['hours'] for e in entries), [1, 4, 7, 10, 13, 16, 19])
+        self.assertEqual(writer.failures, [])
+        self.assertEqual(self.spooled(), [])
+        writer.close()
+
+
+    def test_order_within_user_and_date(self):
+        self.api.add('users/1/time_entries', id=100, date='2014-07-01', hours=0)
+        updates = []
+        put = self.api.put
+        def slow_put(url, data=None, **kwargs):
+            updates.append(data['hours'])
+            return put(url, data, **kwargs)
+        self.api.put = slow_put
+        writer = WriteBehind(self.client, self.path, concurrency=8, batch_size=2, fsync=False)
+
+        for hours in range(1, 11):
+            writer.update(1, 100, date=date(2014, 7, 1), hours=hours)
+        writer.close(5)
+
+        self.assertEqual(updates, range(1, 11))
+        self.assertEqual(self.client.users.time_entries(1).show(100)['hours'], 10)
+
+
+    def test_updates_to_one_entry_stay_in_order(self):
+        self.api.add('users/1/time_entries', id=100, date='2014-07-01', hours=0)
+        updates = []
+        put = self.api.put
+        def slow_put(url, data=None, **kwargs):
+            updates.append(data['hours'])
+            return put(url, data, **kwargs)
+        self.api.put = slow_put
+        writer = WriteBehind(self.client, self.path, concurrency=8, batch_size=1, fsync=False)
+
+        for hours in range(1, 11):
+            kwargs = {'date': date(2014, 7, 1)} if hours % 2 else {}
+            writer.update(1, 100, hours=hours, **kwargs)
+        writer.close(5)
+
+        self.assertEqual(updates, range(1, 11))
+        self.assertEqual(self.client.users.time_entries(1).show(100)['hours'], 10)
+
+
+    def test_invalid_arguments_raise_immediately(self):
+        writer = WriteBehind(self.client, self.path)
+        with self.assertRaises(AssertionError):
+            writer.create(1, hours=8)
+        with self.assertRaises(AssertionError):
+            writer.create(1, date=date(2014, 7, 1), hours=8, mood='happy')
+        writer.close()
+
+
+    def test_resumes_pending_writes(self):
+        with open(self.path, 'w') as f:
+            for seq in (1, 2, 3):
+                f.write(json.dumps({'op': 'write', 'seq': seq, 'method': 'create', 'user_id': 1,
+                                    'data': {'date': '2014-07-01', 'hours': seq}}) + '\n')
+            f.write(json.dumps({'op': 'done', 'seq': 2, 'ok': True}) + '\n')
+            f.write('{"op": "wri')
+
+        done = []
+        writer = WriteBehind(self.client, self.path, on_done=lambda seq, result, error: done.append(seq))
+        writer.flush(5)
+        self.assertEqual(writer.create(1, date='2014-07-02', hours=4), 4)
+        writer.close(5)
+
+        self.assertEqual(sorted(e['hours'] for e in self.api.all('users/1/time_entries')), [1, 3, 4])
+        self.assertEqual(done, [1, 3, 4])
+        self.assertEqual(self.spooled(), [])
+
+
+    def test_failures_are_reported(self):
+        CollectionClient.bulk_retry_delay, delay = 0, CollectionClient.bulk_retry_delay
+        self.addCleanup(setattr, CollectionClient, 'bulk_retry_delay', delay)
+        responses = [FakeResponse(429, {'message': 'Slow down'})]
+        post = self.api.post
+        self.api.post = lambda url, data=None, **kwargs: responses.pop() if responses else post(url, data)
+        writer = WriteBehind(self.client, self.path, retries=2)
+
+        writer.create(1, date='2014-07-01', hours=8)
+        writer.update(1, 999, hours=1)
+        writer.close(5)
+
+        self.assertEqual(len(self.api.all('users/1/time_entries')), 1)
+        self.assertEqual([(op['id'], e.status_code) for op, e in writer.failures], [(999, 404)])
+
+
+    def test_callback_errors_are_reported(self):
+        def on_done(seq, result, error):
+            raise ValueError('callback failed')
+        writer = WriteBehind(self.client, self.path, concurrency=2, batch_size=1, fsync=False, on_done=on_done)
+
+        for day in range(1, 6):
+            writer.create(1, date=date(2014, 7, day), hours=day)
+        self.assertTrue(writer.flush(5))
+        writer.close(5)
+
+        self.assertEqual(len(self.api.all('users/1/time_entries')), 5)
+        self.assertEqual(sorted(op['seq'] for op, e in writer.failures), [1, 2, 3, 4, 5])
+        self.assertTrue(all(isinstance(e, ValueError) for op, e in writer.failures))